@@ -4,93 +4,380 @@ Live $25 Hyperliquid Trading Bot with Real Order Execution
 WARNING: This bot uses REAL money - start with minimum amounts!
 """
 
-import requests
-import json
+import asyncio
+import math
+from bisect import bisect_right
+import httpx
+import numpy as np
+import orjson
+import websockets
 import time
-import os
-from datetime import datetime, timedelta
-import hmac
-import hashlib
+from collections import deque
+from datetime import datetime
+from enum import IntEnum
+from pathlib import Path
 from eth_account import Account
 from eth_account.messages import encode_defunct
 
-# Import configuration (you need to create this file)
+# Load configuration (created by setup_real_trading.py)
 try:
-    from config_keys import HYPERLIQUID_PRIVATE_KEY, HYPERLIQUID_ADDRESS, TRADING_CONFIG, RISK_LIMITS, DISCORD_WEBHOOK_URL
-except ImportError:
-    print("❌ CONFIG ERROR: Create 'config_keys.py' from 'config_keys.py.example'")
-    print("❌ Fill in your Hyperliquid API keys first!")
+    with open(Path(__file__).with_name("config_keys.json"), "rb") as f:
+        _keys = orjson.loads(f.read())
+    HYPERLIQUID_PRIVATE_KEY = _keys["HYPERLIQUID_PRIVATE_KEY"]
+    HYPERLIQUID_ADDRESS = _keys["HYPERLIQUID_ADDRESS"]
+    TRADING_CONFIG = _keys["TRADING_CONFIG"]
+    RISK_LIMITS = _keys["RISK_LIMITS"]
+    DISCORD_WEBHOOK_URL = _keys.get("DISCORD_WEBHOOK_URL", "")
+except FileNotFoundError:
+    # Legacy Python config from older setups
+    try:
+        from config_keys import HYPERLIQUID_PRIVATE_KEY, HYPERLIQUID_ADDRESS, TRADING_CONFIG, RISK_LIMITS, DISCORD_WEBHOOK_URL
+    except ImportError:
+        print("❌ CONFIG ERROR: Run 'python3 setup_real_trading.py' to create 'config_keys.json'")
+        print("❌ Fill in your Hyperliquid API keys first!")
+        exit(1)
+except (KeyError, orjson.JSONDecodeError) as e:
+    print(f"❌ CONFIG ERROR: Invalid 'config_keys.json': {e}")
     exit(1)
 
+def format_order_message(symbol, size, price, side, nonce):
+    """Signed order message as compact JSON bytes.
+
+    Byte-identical to orjson.dumps({"order": {...}, "nonce": nonce}) for the
+    fixed GTC limit order, as long as symbol and side need no JSON escaping.
+    """
+    return (
+        f'{{"order":{{"a":"{symbol}","b":"{size}","p":"{price}","s":"{side}",'
+        f'"r":"GTC","t":{{"limit":{{"tif":"GTC"}}}}}},"nonce":{nonce}}}'
+    ).encode()
+
+def _is_plain_json_string(value):
+    """True if value serializes to JSON without any escaping"""
+    return orjson.dumps(value) == b'"' + value.encode() + b'"'
+
+class RejectReason(IntEnum):
+    """Why an order was not placed"""
+    NONE = 0
+    RATE_LIMITED = 1
+    NETWORK = 2
+    STALE_PRICE = 3
+    RISK_BLOCKED = 4
+    SIGNATURE = 5
+    EXCHANGE_REJECTED = 6
+    CIRCUIT_OPEN = 7
+    UNKNOWN = 8
+
+class CircuitBreaker:
+    """Stops order submission after repeated failures within a time window"""
+
+    def __init__(self, fail_max=5, window_s=60.0, cooldown=30.0):
+        self.fail_max = fail_max
+        self.window_s = window_s
+        self.cooldown = cooldown
+        self._failures = deque()
+        self._opened_at = None
+
+    def allow(self):
+        """True unless the breaker tripped less than `cooldown` seconds ago"""
+        if self._opened_at is None:
+            return True
+        # After the cooldown one probe order is let through (half-open). Granting it
+        # re-arms the cooldown, so a probe that ends without success or failure
+        # (e.g. a risk-blocked order) still allows only one probe per cooldown
+        now = time.monotonic()
+        if now - self._opened_at < self.cooldown:
+            return False
+        self._opened_at = now
+        return True
+
+    def record_failure(self):
+        now = time.monotonic()
+        if self._opened_at is not None:
+            # Failed half-open probe - stay open for another full cooldown
+            self._opened_at = now
+            return
+        self._failures.append(now)
+        while self._failures and now - self._failures[0] > self.window_s:
+            self._failures.popleft()
+        if len(self._failures) >= self.fail_max:
+            self._opened_at = now
+
+    def record_success(self):
+        self._failures.clear()
+        self._opened_at = None
+
 class LiveMicroTrader:
     def __init__(self):
         self.base_url = "https://api.hyperliquid.xyz/info"
         self.exchange_url = "https://api.hyperliquid.xyz/exchange"
+        self.ws_url = "wss://api.hyperliquid.xyz/ws"
 
         # Configuration
-        self.capital = TRADING_CONFIG["capital"]
+        self.capital = float(TRADING_CONFIG["capital"])
         self.leverage = TRADING_CONFIG["leverage"]
-        self.max_position_value = TRADING_CONFIG["max_position_value"]
-        self.position_size_dollars = TRADING_CONFIG["position_size_dollars"]
+        self.max_position_value = float(TRADING_CONFIG["max_position_value"])
+        self.position_size_dollars = float(TRADING_CONFIG["position_size_dollars"])
         self.symbol = TRADING_CONFIG["symbol"]
-        self.stop_loss_pct = TRADING_CONFIG["stop_loss_pct"]
-        self.take_profit_pct = TRADING_CONFIG["take_profit_pct"]
-        self.max_daily_loss = TRADING_CONFIG["max_daily_loss"]
+        self.stop_loss_pct = float(TRADING_CONFIG["stop_loss_pct"])
+        self.take_profit_pct = float(TRADING_CONFIG["take_profit_pct"])
+        self.max_daily_loss = float(TRADING_CONFIG["max_daily_loss"])
 
-        # Risk management
+        # Risk management - unpacked once so the per-tick checks are plain attribute loads
         self.risk_limits = RISK_LIMITS
+        self.max_daily_trades = int(RISK_LIMITS["max_daily_trades"])
+        self._daily_loss_floor = -self.max_daily_loss
+        self._stop_loss_floor = -self.stop_loss_pct
+        self._near_stop = -0.8 * self.stop_loss_pct
+        self._near_take = 0.8 * self.take_profit_pct
+
+        # Reject a broken risk config before any order can go out
+        for name in ("max_position_value", "position_size_dollars", "stop_loss_pct",
+                     "take_profit_pct", "max_daily_loss", "max_daily_trades"):
+            if not getattr(self, name) > 0:
+                print(f"❌ CONFIG ERROR: {name} must be positive, got {getattr(self, name)}")
+                exit(1)
 
         # Account setup
         self.private_key = HYPERLIQUID_PRIVATE_KEY
         self.address = HYPERLIQUID_ADDRESS
 
+        # Pooled async HTTP client - created in __aenter__, closed in __aexit__
+        self.client = None
+
+        # In-flight Discord posts; alerts never block the trading loop
+        self._alert_tasks = set()
+        # Constant head/tail of the webhook body; only the message is spliced in
+        self._alert_prefix = '{"username":"MicroTrader Bot","content":"🤖 MicroTrader Alert: '.encode()
+        self._alert_suffix = b'"}'
+
+        # Latest (mid, bid, ask) pushed by the l2Book WebSocket stream
+        self._latest_bbo = None
+        self._bbo_ready = asyncio.Event()
+        self._bbo_task = None
+
+        # (monotonic time, mid, bid, ask) of the last REST snapshot
+        self._price_cache = (0.0, None, None, None)
+        self.price_cache_ttl = 0.25
+
+        # In-flight /info reads keyed by request type; concurrent callers share one POST
+        self._inflight = {}
+        self._book_request = orjson.dumps({"type": "l2Book", "coin": self.symbol})
+        self._account_request = orjson.dumps({"type": "clearinghouseState", "user": self.address})
+
+        # Reusable (px, sz) buffers for book depth; grown only when a deeper book arrives
+        self._bid_buf = np.empty((20, 2), dtype=np.float64)
+        self._ask_buf = np.empty((20, 2), dtype=np.float64)
+        self.microprice = None
+
+        # Adaptive polling: fast/slow EWMA of |dP|/P drive the loop interval
+        self.base_interval = 30.0
+        self.min_interval = 1.0
+        self.max_interval = 60.0
+        self._last_mid = None
+        self._ewma_vol = 0.0        # fast, reacts within a few ticks
+        self._baseline_vol = 0.0    # slow, the "normal" level to compare against
+
+        # Entry regimes (arbitrary thresholds for testing): buy under $0.50,
+        # short over $0.80. bisect_right over the bounds picks the regime in one
+        # call; nextafter makes exactly $0.80 fall in the neutral band.
+        self.buy_below = 0.5
+        self.short_above = 0.8
+        self._entry_bounds = (self.buy_below, math.nextafter(self.short_above, math.inf))
+        self._entry_actions = (
+            ("B", "📈 ENTRY SIGNAL: BUY"),
+            None,
+            ("S", "📉 ENTRY SIGNAL: SHORT"),
+        )
+
         # Trading state
         self.daily_trades = 0
         self.daily_pnl = 0.0
         self.last_trade_time = None
         self.current_position = None
+        self._inv_entry = 0.0   # 1 / entry_price of the open position
+        self._pos_sign = 0.0    # +1.0 long, -1.0 short
 
         # Safety checks
         if not self.private_key or not self.address:
-            print("❌ ERROR: Missing API keys in config_keys.py")
+            print("❌ ERROR: Missing API keys in config_keys.json")
             exit(1)
 
+        # Key derivation is expensive - do it once, not per order
+        self._account = Account.from_key(self.private_key)
+
+        # Static order scaffolding; per-order fields are filled in around it
+        # so the signed key order (a, b, p, s, r, t) stays unchanged
+        self._order_tif = "GTC"
+        self._order_type = {"limit": {"tif": "GTC"}}
+        self._last_nonce = 0
+        # The fixed-template signer is only safe for symbols that need no escaping
+        self._template_signing = _is_plain_json_string(self.symbol)
+
+        # Order submission guard; last_reject records why the latest order did not go out
+        self._breaker = CircuitBreaker(fail_max=5, window_s=60)
+        self.last_reject = RejectReason.NONE
+
         print(f"🚀 LIVE MICRO TRADER - ${self.capital} CAPITAL")
         print(f"⚠️  WARNING: REAL MONEY TRADING ACTIVE")
         print(f"💰 Position size: ${self.position_size_dollars}")
         print(f"📈 Leverage: {self.leverage}x")
         print(f"🎯 Max daily loss: ${self.max_daily_loss}")
 
-    def get_price(self):
+    async def __aenter__(self):
+        limits = httpx.Limits(max_connections=100, max_keepalive_connections=40, keepalive_expiry=30)
+        self.client = httpx.AsyncClient(
+            timeout=10,
+            headers={"Content-Type": "application/json"},
+            transport=httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=2),
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        # Let queued alerts (e.g. the shutdown notice) go out first
+        if self._alert_tasks:
+            await asyncio.gather(*self._alert_tasks, return_exceptions=True)
+        await self.client.aclose()
+        self.client = None
+
+    @staticmethod
+    def _fill_levels(buf, side):
+        """Copy one side of the book into a (px, sz) float64 buffer"""
+        n = len(side)
+        if n > len(buf):
+            buf = np.empty((n, 2), dtype=np.float64)
+        buf[:n] = np.fromiter(
+            (float(level[key]) for level in side for key in ('px', 'sz')),
+            dtype=np.float64, count=2 * n
+        ).reshape(n, 2)
+        return buf
+
+    def _parse_bbo(self, book):
+        """Extract (mid, bid, ask) from an l2Book snapshot"""
+        levels = book.get('levels')
+        if not (levels and len(levels) >= 2 and levels[0] and levels[1]):
+            return None
+
+        bids = self._bid_buf = self._fill_levels(self._bid_buf, levels[0])
+        asks = self._ask_buf = self._fill_levels(self._ask_buf, levels[1])
+
+        bid, bid_sz = bids[0]
+        ask, ask_sz = asks[0]
+        # Size-weighted top of book leans toward the thinner side
+        self.microprice = float((bid * ask_sz + ask * bid_sz) / (bid_sz + ask_sz))
+        mid = float((bid + ask) / 2)
+        self._update_volatility(mid)
+        return mid, float(bid), float(ask)
+
+    def _update_volatility(self, mid):
+        """Fold the latest mid-price move into the volatility EWMAs"""
+        if self._last_mid:
+            move = abs(mid - self._last_mid) / self._last_mid
+            if self._baseline_vol:
+                self._ewma_vol += 0.1 * (move - self._ewma_vol)
+                self._baseline_vol += 0.01 * (move - self._baseline_vol)
+            else:
+                self._ewma_vol = self._baseline_vol = move
+        self._last_mid = mid
+
+    def _adaptive_interval(self):
+        """Seconds until the next strategy tick"""
+        # Near stop-loss or take-profit: check every second
+        if self.current_position and self._last_mid:
+            pnl_pct = self._pos_sign * (self._last_mid * self._inv_entry - 1.0)
+            if pnl_pct <= self._near_stop or pnl_pct >= self._near_take:
+                return self.min_interval
+
+        if not self._ewma_vol or not self._baseline_vol:
+            return self.base_interval
+
+        # Calm market -> poll less, volatile market -> poll more
+        interval = self.base_interval * self._baseline_vol / self._ewma_vol
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    async def _bbo_listener(self):
+        """Keep self._latest_bbo current from the l2Book WebSocket feed"""
+        subscribe = orjson.dumps({
+            "method": "subscribe",
+            "subscription": {"type": "l2Book", "coin": self.symbol}
+        }).decode()
+
+        while True:
+            try:
+                async with websockets.connect(self.ws_url) as ws:
+                    await ws.send(subscribe)
+                    async for msg in ws:
+                        update = orjson.loads(msg)
+                        if update.get("channel") != "l2Book":
+                            continue
+                        bbo = self._parse_bbo(update["data"])
+                        if bbo:
+                            self._latest_bbo = bbo
+                            self._bbo_ready.set()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️  Price stream error: {e} - reconnecting")
+
+            # Stream is down - fall back to REST until it is back
+            self._latest_bbo = None
+            self._bbo_ready.clear()
+            await asyncio.sleep(1)
+
+    async def get_price(self):
         """Get current WIF price"""
+        if self._latest_bbo is not None:
+            return self._latest_bbo
+
+        # Several reads within one tick share a single REST snapshot
+        now = time.monotonic()
+        if now - self._price_cache[0] < self.price_cache_ttl:
+            return self._price_cache[1:]
+
+        return await self._coalesce("l2Book", self._fetch_book)
+
+    async def _coalesce(self, key, fetch):
+        """Run fetch() once for all concurrent callers asking for the same key"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled caller does not cancel the shared request
+        return await asyncio.shield(task)
+
+    async def _fetch_book(self):
+        """REST l2Book snapshot -> (mid, bid, ask)"""
         try:
-            data = {"type": "l2Book", "coin": self.symbol}
-            response = requests.post(self.base_url,
-                                   headers={'Content-Type': 'application/json'},
-                                   data=json.dumps(data))
+            response = await self.client.post(self.base_url, content=self._book_request)
 
             if response.status_code == 200:
-                book = response.json()
-                if 'levels' in book and len(book['levels']) >= 2:
-                    bid = float(book['levels'][0][0]['px'])
-                    ask = float(book['levels'][1][0]['px'])
-                    mid_price = (bid + ask) / 2
-                    return mid_price, bid, ask
+                bbo = self._parse_bbo(orjson.loads(response.content))
+                if bbo:
+                    self._price_cache = (time.monotonic(), *bbo)
+                    return bbo
             return None, None, None
         except Exception as e:
             print(f"❌ Price fetch error: {e}")
             return None, None, None
 
-    def get_account_info(self):
+    async def _fresh_bbo(self, bid, ask):
+        """Re-read bid/ask right before an exit, keeping the tick's quote if that fails"""
+        _, fresh_bid, fresh_ask = await self.get_price()
+        if fresh_bid is None:
+            return bid, ask
+        return fresh_bid, fresh_ask
+
+    async def get_account_info(self):
         """Get account information and positions"""
+        return await self._coalesce("clearinghouseState", self._fetch_account)
+
+    async def _fetch_account(self):
+        """REST clearinghouseState for this wallet"""
         try:
-            data = {"type": "clearinghouseState", "user": self.address}
-            response = requests.post(self.base_url,
-                                   headers={'Content-Type': 'application/json'},
-                                   data=json.dumps(data))
+            response = await self.client.post(self.base_url, content=self._account_request)
 
             if response.status_code == 200:
-                return response.json()
+                return orjson.loads(response.content)
             return None
         except Exception as e:
             print(f"❌ Account info error: {e}")
@@ -103,28 +390,50 @@ class LiveMicroTrader:
         size = self.position_size_dollars / price
         return round(size, 6)  # Round to 6 decimal places for precision
 
+    def set_position(self, size, entry_price):
+        """Record the open position (signed size) or clear it when flat"""
+        if size == 0:
+            self.current_position = None
+            self._inv_entry = 0.0
+            self._pos_sign = 0.0
+            return
+
+        side = 'long' if size > 0 else 'short'
+        self.current_position = {
+            'size': abs(size),
+            'side': side,
+            'entry_price': entry_price
+        }
+        # Hoist the reciprocal and direction out of the per-tick P&L check
+        self._inv_entry = 1.0 / entry_price
+        self._pos_sign = 1.0 if side == 'long' else -1.0
+
     def send_alert(self, message):
-        """Send Discord alert"""
+        """Send Discord alert in the background (fire-and-forget)"""
         if not DISCORD_WEBHOOK_URL:
             return
 
+        task = asyncio.create_task(self._post_alert(message))
+        self._alert_tasks.add(task)
+        task.add_done_callback(self._alert_tasks.discard)
+
+    async def _post_alert(self, message):
+        """Deliver a single Discord alert"""
         try:
-            data = {
-                "content": f"🤖 MicroTrader Alert: {message}",
-                "username": "MicroTrader Bot"
-            }
-            requests.post(DISCORD_WEBHOOK_URL, json=data)
-        except:
+            # orjson handles quoting/control chars; strip its surrounding quotes
+            body = self._alert_prefix + orjson.dumps(str(message))[1:-1] + self._alert_suffix
+            await self.client.post(DISCORD_WEBHOOK_URL, content=body)
+        except Exception:
             print("⚠️  Failed to send Discord alert")
 
     def check_daily_limits(self):
         """Check if we've hit daily trading limits"""
-        if self.daily_pnl <= -self.max_daily_loss:
+        if self.daily_pnl <= self._daily_loss_floor:
             print("🛑 DAILY LOSS LIMIT REACHED - STOPPING TRADING")
             self.send_alert("Daily loss limit reached - trading stopped")
             return False
 
-        if self.daily_trades >= self.risk_limits["max_daily_trades"]:
+        if self.daily_trades >= self.max_daily_trades:
             print("🛑 DAILY TRADE LIMIT REACHED")
             return False
 
@@ -146,72 +455,111 @@ class LiveMicroTrader:
 
         return True
 
-    def execute_market_order(self, side, size, price):
-        """Execute a market order on Hyperliquid"""
+    async def execute_market_order(self, side, size, price):
+        """Execute a market order on Hyperliquid, returns (success, RejectReason)"""
+        if not self._breaker.allow():
+            print("🛑 Circuit breaker open - order skipped")
+            return False, RejectReason.CIRCUIT_OPEN
+
+        if not price or price <= 0:
+            print("❌ Order skipped: no valid price")
+            return False, RejectReason.STALE_PRICE
+
+        # Exits must always be allowed; only cap orders that open a position
+        if not self.current_position and size * price > self.max_position_value:
+            print(f"❌ Order skipped: ${size * price:.2f} exceeds max position value")
+            return False, RejectReason.RISK_BLOCKED
+
         try:
-            timestamp = int(time.time() * 1000)
+            # Integer ms clock; bump on collision so burst orders keep unique nonces
+            timestamp = time.time_ns() // 1_000_000
+            if timestamp <= self._last_nonce:
+                timestamp = self._last_nonce + 1
+            self._last_nonce = timestamp
 
             # Order data
-            order_data = {
-                "order": {
-                    "a": self.symbol,  # asset
-                    "b": str(size),    # size
-                    "p": str(price),   # price
-                    "s": side,         # side: "B" for buy, "S" for sell
-                    "r": "GTC",        # time in force: Good Till Cancelled
-                    "t": {"limit": {"tif": "GTC"}},  # order type
-                },
-                "nonce": timestamp
+            order = {
+                "a": self.symbol,        # asset
+                "b": str(size),          # size
+                "p": str(price),         # price
+                "s": side,               # side: "B" for buy, "S" for sell
+                "r": self._order_tif,    # time in force: Good Till Cancelled
+                "t": self._order_type,   # order type
             }
 
-            # Create signature
-            message = json.dumps(order_data, separators=(',', ':'))
-            message_hash = hashlib.sha256(message.encode()).hexdigest()
+            # Create signature - compact JSON bytes, same form as
+            # json.dumps(separators=(',', ':'))
+            if self._template_signing and (side == "B" or side == "S"):
+                msg_bytes = format_order_message(self.symbol, order["b"], order["p"], side, timestamp)
+            else:
+                msg_bytes = orjson.dumps({"order": order, "nonce": timestamp})
 
-            account = Account.from_key(self.private_key)
-            signature = account.sign_message(encode_defunct(text=message))
+            try:
+                signature = self._account.sign_message(encode_defunct(primitive=msg_bytes))
+            except Exception as e:
+                print(f"❌ Order signing error: {e}")
+                return False, RejectReason.SIGNATURE
 
             # Request payload
             payload = {
-                "order": order_data["order"],
+                "order": order,
                 "signature": signature.signature.hex(),
                 "nonce": timestamp
             }
 
             # Send order
-            response = requests.post(
-                self.exchange_url,
-                headers={'Content-Type': 'application/json'},
-                data=json.dumps(payload)
-            )
+            response = await self.client.post(self.exchange_url, content=orjson.dumps(payload))
 
             if response.status_code == 200:
-                result = response.json()
+                # Exchange answered - the connection is healthy either way
+                self._breaker.record_success()
+                result = orjson.loads(response.content)
                 if result.get("status") == "ok":
                     print(f"✅ {side.upper()} order executed: {size} {self.symbol} at ${price}")
                     self.send_alert(f"Executed {side.upper()}: {size} {self.symbol} @ ${price}")
-                    return True
+                    return True, RejectReason.NONE
                 else:
                     print(f"❌ Order rejected: {result.get('response', 'Unknown error')}")
-                    return False
-            else:
-                print(f"❌ Order failed: HTTP {response.status_code}")
-                print(f"Response: {response.text}")
-                return False
-
+                    return False, RejectReason.EXCHANGE_REJECTED
+
+            print(f"❌ Order failed: HTTP {response.status_code}")
+            print(f"Response: {response.text}")
+            if response.status_code == 429:
+                self._breaker.record_failure()
+                return False, RejectReason.RATE_LIMITED
+            if response.status_code >= 500:
+                self._breaker.record_failure()
+                return False, RejectReason.NETWORK
+            return False, RejectReason.EXCHANGE_REJECTED
+
+        except httpx.HTTPError as e:
+            print(f"❌ Order network error: {e}")
+            self._breaker.record_failure()
+            return False, RejectReason.NETWORK
         except Exception as e:
             print(f"❌ Order execution error: {e}")
-            return False
+            return False, RejectReason.UNKNOWN
+
+    async def submit_order(self, side, size, price):
+        """Place an order from the strategy, recording any reject reason"""
+        success, reason = await self.execute_market_order(side, size, price)
+        self.last_reject = reason
+        if not success:
+            print(f"⚠️  Order not placed: {reason.name}")
+        return success
 
-    def simple_strategy(self):
+    async def simple_strategy(self):
         """Simple mean reversion strategy for testing"""
-        price, bid, ask = self.get_price()
+        # Book and account reads are independent - overlap the round-trips
+        (price, bid, ask), account_info = await asyncio.gather(
+            self.get_price(), self.get_account_info()
+        )
         if price is None:
             return False
 
         position_size = self.calculate_position_size(price)
 
-        print(f"📊 Current WIF: ${price:.6f} | Bid: ${bid:.6f} | Ask: ${ask:.6f}")
+        print(f"📊 Current WIF: ${price:.6f} | Bid: ${bid:.6f} | Ask: ${ask:.6f} | Micro: ${self.microprice:.6f}")
 
         # Check daily limits
         if not self.check_daily_limits():
@@ -221,8 +569,7 @@ class LiveMicroTrader:
         if not self.check_risk_limits(price, position_size):
             return False
 
-        # Get account info to check current positions
-        account_info = self.get_account_info()
+        # Use account info to check current positions
         if account_info and 'assetPositions' in account_info:
             # Check if we have open WIF position
             wif_position = next((pos for pos in account_info['assetPositions']
@@ -230,72 +577,77 @@ class LiveMicroTrader:
             if wif_position:
                 size = float(wif_position['position']['szi'])
                 if abs(size) > 0:
-                    self.current_position = {
-                        'size': abs(size),
-                        'side': 'long' if size > 0 else 'short',
-                        'entry_price': float(wif_position['position']['entryPx'])
-                    }
+                    self.set_position(size, float(wif_position['position']['entryPx']))
                     print(f"📈 Current position: {self.current_position['side']} {self.current_position['size']} @ ${self.current_position['entry_price']:.6f}")
                 else:
-                    self.current_position = None
+                    self.set_position(0, 0.0)
 
         # Simple strategy logic
         if self.current_position:
             # Check for exit conditions
-            pnl_pct = 0
-            if self.current_position['side'] == 'long':
-                pnl_pct = (price - self.current_position['entry_price']) / self.current_position['entry_price']
-            else:
-                pnl_pct = (self.current_position['entry_price'] - price) / self.current_position['entry_price']
+            pnl_pct = self._pos_sign * (price * self._inv_entry - 1.0)
 
             if pnl_pct >= self.take_profit_pct:
                 print(f"🎯 TAKE PROFIT: {pnl_pct*100:.2f}% gain")
                 side = "S" if self.current_position['side'] == 'long' else "B"
-                return self.execute_market_order(side, self.current_position['size'], ask if side == "S" else bid)
-            elif pnl_pct <= -self.stop_loss_pct:
+                bid, ask = await self._fresh_bbo(bid, ask)
+                return await self.submit_order(side, self.current_position['size'], ask if side == "S" else bid)
+            elif pnl_pct <= self._stop_loss_floor:
                 print(f"🛑 STOP LOSS: {pnl_pct*100:.2f}% loss")
                 side = "S" if self.current_position['side'] == 'long' else "B"
-                return self.execute_market_order(side, self.current_position['size'], ask if side == "S" else bid)
+                bid, ask = await self._fresh_bbo(bid, ask)
+                return await self.submit_order(side, self.current_position['size'], ask if side == "S" else bid)
         else:
             # Check for entry conditions (simple momentum)
-            # Buy if price seems "low" (arbitrary threshold for testing)
-            if price < 0.5:  # Buy WIF under $0.50
-                print(f"📈 ENTRY SIGNAL: BUY at ${price:.6f}")
-                return self.execute_market_order("B", position_size, ask)
-            elif price > 0.8:  # Short WIF over $0.80
-                print(f"📉 ENTRY SIGNAL: SHORT at ${price:.6f}")
-                return self.execute_market_order("S", position_size, bid)
+            action = self._entry_actions[bisect_right(self._entry_bounds, price)]
+            if action:
+                side, label = action
+                print(f"{label} at ${price:.6f}")
+                return await self.submit_order(side, position_size, ask if side == "B" else bid)
 
         return False
 
-    def run(self):
+    async def run(self):
         """Main trading loop"""
         print(f"\n🚀 STARTING LIVE TRADING")
         print(f"⚠️  REAL MONEY MODE - CAPITAL: ${self.capital}")
-        print(f"📊 Monitoring {self.symbol} every 30 seconds")
+        print(f"📊 Monitoring {self.symbol} every {self.min_interval:.0f}-{self.max_interval:.0f}s (volatility adaptive)")
         print("=" * 50)
 
         self.send_alert("MicroTrader started - Live trading mode activated")
 
+        self._bbo_task = asyncio.create_task(self._bbo_listener())
+        try:
+            # Give the stream a moment to deliver its first snapshot
+            await asyncio.wait_for(self._bbo_ready.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            print("⚠️  Price stream not ready - using REST snapshots")
+
         try:
             while True:
                 timestamp = datetime.now().strftime("%H:%M:%S")
                 print(f"\n⏰ {timestamp}")
 
                 # Execute strategy
-                if self.simple_strategy():
+                if await self.simple_strategy():
                     self.daily_trades += 1
                     self.last_trade_time = datetime.now()
 
                 # Sleep before next check
-                time.sleep(30)
+                await asyncio.sleep(self._adaptive_interval())
 
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError):
             print(f"\n⏹️  Trading stopped by user")
             self.send_alert("Trading stopped by user")
         except Exception as e:
             print(f"\n❌ ERROR: {e}")
             self.send_alert(f"Trading error: {e}")
+        finally:
+            self._bbo_task.cancel()
+
+async def run_trader():
+    async with LiveMicroTrader() as trader:
+        await trader.run()
 
 def main():
     print("🎯 $25 Hyperliquid LIVE Micro Trader")
@@ -310,8 +662,10 @@ def main():
         print("❌ Aborted - Not starting live trading")
         return
 
-    trader = LiveMicroTrader()
-    trader.run()
+    try:
+        asyncio.run(run_trader())
+    except KeyboardInterrupt:
+        pass
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
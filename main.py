@@ -11,7 +11,6 @@ import argparse
 import sys
 import os
 from pathlib import Path
-from decimal import Decimal
 from typing import Optional
 from datetime import datetime
 from termcolor import colored
@@ -68,9 +67,18 @@ def load_config(config_path: str) -> dict:
         sys.exit(1)
 
 
-async def main():
-    """Main execution loop"""
+def parse_args() -> argparse.Namespace:
+    """Parse the command line"""
     parser = argparse.ArgumentParser(description="KAIROS Algo Trading System")
+    parser.add_argument(
+        "--engine",
+        choices=["kairos", "api"],
+        default="kairos",
+        help="kairos: CLI trading engine, api: FastAPI strategy server",
+    )
+    parser.add_argument(
+        "--port", type=int, default=8000, help="Port for the API server (--engine api)"
+    )
     parser.add_argument(
         "--config", "-c", default="config.json", help="Configuration file path"
     )
@@ -85,10 +93,29 @@ async def main():
         "--live", action="store_true", help="Use live environment (overrides --sandbox)"
     )
 
-    args = parser.parse_args()
+    return parser.parse_args()
 
-    setup_logging()
-    print_banner()
+
+def run_api(args: argparse.Namespace):
+    """Serve the FastAPI strategy server with the same settings as src/api/main.py"""
+    import uvicorn
+    from src.api.main import app
+
+    # uvicorn creates and owns the loop, so it runs outside asyncio.run
+    config = uvicorn.Config(
+        app,
+        host="0.0.0.0",
+        port=args.port,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets",
+        workers=1,
+    )
+    uvicorn.Server(config).run()
+
+
+async def main(args: argparse.Namespace):
+    """Main execution loop"""
     logger = logging.getLogger(__name__)
 
     config_data = load_config(args.config)
@@ -130,21 +157,7 @@ async def main():
         logger.error(f"Failed to initialize client: {e}")
         return
 
-    engine_config = TradingEngineConfig(
-        hyperliquid_api_key="",
-        hyperliquid_secret_key="",
-        sandbox_mode=sandbox_mode,
-        max_portfolio_risk=Decimal(str(config_data.get("max_portfolio_risk", "1000"))),
-        max_total_leverage=config_data.get("max_total_leverage", 10),
-        daily_loss_limit=Decimal(str(config_data.get("daily_loss_limit", "100"))),
-        emergency_stop_enabled=True,
-        enable_market_making=config_data.get("enable_market_making", False),
-        enable_turtle_trading=config_data.get("enable_turtle_trading", False),
-        enable_correlation=config_data.get("enable_correlation", False),
-        enable_mean_reversion=config_data.get("enable_mean_reversion", False),
-        high_frequency_mode=config_data.get("high_frequency_mode", False),
-        parallel_execution=True,
-    )
+    engine_config = TradingEngineConfig.from_dict(config_data, sandbox_mode=sandbox_mode)
 
     engine = TradingEngine(client, engine_config)
 
@@ -156,4 +169,11 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_args()
+    setup_logging()
+    print_banner()
+
+    if args.engine == "api":
+        run_api(args)
+    else:
+        asyncio.run(main(args))
@@ -4,16 +4,28 @@ $25 Hyperliquid Trading Bot
 Minimal viable bot for testing with small capital
 """
 
-import requests
+import asyncio
+import aiohttp
+import websockets
 import json
 import time
 import os
-from datetime import datetime
+from dataclasses import dataclass
+
+@dataclass(slots=True)
+class Trade:
+    """One paper trade; ts is a unix timestamp, formatted only when printed"""
+    ts: int
+    action: str
+    price: float
+    size: float
+    value: float
 
 class MicroTrader:
     def __init__(self):
         self.base_url = "https://api.hyperliquid.xyz/info"
         self.exchange_url = "https://api.hyperliquid.xyz/exchange"
+        self.ws_url = "wss://api.hyperliquid.xyz/ws"
 
         # Trading parameters for $25 capital
         self.capital = 25.0
@@ -24,47 +36,88 @@ class MicroTrader:
         self.symbol = "WIF"
         self.position_size_dollars = 5.0  # Start with $5 positions
 
+        # Pooled HTTP session, opened in __aenter__ - one TLS handshake reused across all polls
+        self.session = None
+        self.timeout = aiohttp.ClientTimeout(sock_connect=1, sock_read=3)
+
+        # Position of self.symbol in the exchange universe, found on first snapshot
+        self._sym_idx = None
+
+        # Paper session ends if the price stream goes quiet this long (seconds)
+        self.stream_idle_timeout = 30
+
         print(f"🚀 Micro Trader initialized with ${self.capital} capital")
         print(f"💰 Effective buying power: ${self.max_position_value} (10x leverage)")
         print(f"📈 Starting position size: ${self.position_size_dollars}")
 
-    def get_price(self):
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=8, ttl_dns_cache=300, keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Release pooled connections"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def _post_info(self, data):
+        """POST to /info, returns the decoded body or None on a non-200 reply"""
+        async with self.session.post(self.base_url, json=data) as response:
+            if response.status == 200:
+                return await response.json()
+            return None
+
+    async def get_price(self):
         """Get current price of WIF"""
         try:
-            data = {"type": "l2Book", "coin": self.symbol}
-            response = requests.post(self.base_url,
-                                   headers={'Content-Type': 'application/json'},
-                                   data=json.dumps(data))
-
-            if response.status_code == 200:
-                book = response.json()
-                if 'levels' in book and len(book['levels']) >= 2:
-                    bid = float(book['levels'][0][0]['px'])
-                    ask = float(book['levels'][1][0]['px'])
-                    mid_price = (bid + ask) / 2
-                    return mid_price, bid, ask
+            book = await self._post_info({"type": "l2Book", "coin": self.symbol})
+            if book is not None:
+                return self._parse_book(book)
             return None, None, None
         except Exception as e:
             print(f"❌ Price fetch error: {e}")
             return None, None, None
 
-    def get_metadata(self):
-        """Get trading metadata for WIF"""
+    @staticmethod
+    def _parse_book(book):
+        """Extract (mid, bid, ask) from an l2Book snapshot"""
+        levels = book.get('levels')
+        if levels and len(levels) >= 2 and levels[0] and levels[1]:
+            bid = float(levels[0][0]['px'])
+            ask = float(levels[1][0]['px'])
+            return (bid + ask) / 2, bid, ask
+        return None, None, None
+
+    async def get_market_snapshot(self):
+        """Get price, bid, ask and metadata for WIF in a single /info call"""
         try:
-            data = {"type": "meta"}
-            response = requests.post(self.base_url,
-                                   headers={'Content-Type': 'application/json'},
-                                   data=json.dumps(data))
-
-            if response.status_code == 200:
-                meta = response.json()
-                for symbol_data in meta['universe']:
-                    if symbol_data['name'] == self.symbol:
-                        return symbol_data
-            return None
+            snapshot = await self._post_info({"type": "metaAndAssetCtxs"})
+            if snapshot is not None:
+                meta, asset_ctxs = snapshot
+                universe = meta['universe']
+
+                idx = self._sym_idx
+                if idx is None or idx >= len(universe) or universe[idx]['name'] != self.symbol:
+                    idx = next((i for i, symbol_data in enumerate(universe)
+                                if symbol_data['name'] == self.symbol), None)
+                    if idx is None:
+                        return None, None, None, None
+                    self._sym_idx = idx
+
+                ctx = asset_ctxs[idx]
+                price = float(ctx.get('midPx') or ctx['markPx'])
+                # Impact prices are the executable bid/ask for a standard clip
+                impact = ctx.get('impactPxs') or [price, price]
+                bid, ask = float(impact[0]), float(impact[1])
+                return price, bid, ask, universe[idx]
+            return None, None, None, None
         except Exception as e:
-            print(f"❌ Metadata fetch error: {e}")
-            return None
+            print(f"❌ Market snapshot error: {e}")
+            return None, None, None, None
 
     def calculate_position_size(self, price):
         """Calculate position size based on price and allocated dollars"""
@@ -75,16 +128,16 @@ class MicroTrader:
         size = self.position_size_dollars / price
         return round(size, 4)  # Round to 4 decimal places
 
-    def simulate_trade(self):
+    async def simulate_trade(self):
         """Simulate a trade without actual API keys"""
         print("\n📊 SIMULATION MODE - Testing strategy logic")
 
-        price, bid, ask = self.get_price()
+        # Price context and metadata arrive together in one round-trip
+        price, bid, ask, metadata = await self.get_market_snapshot()
         if price is None:
             print("❌ Cannot fetch price - simulation failed")
             return False
 
-        metadata = self.get_metadata()
         if metadata is None:
             print("❌ Cannot fetch metadata - simulation failed")
             return False
@@ -108,52 +161,51 @@ class MicroTrader:
 
         return True
 
-    def run_paper_trading(self):
-        """Run paper trading simulation"""
+    async def run_paper_trading(self, checks=10):
+        """Run paper trading simulation on live l2Book pushes"""
         print("\n📝 PAPER TRADING MODE")
         print("=" * 50)
 
         trades = []
         portfolio_value = self.capital
+        subscribe = {"method": "subscribe", "subscription": {"type": "l2Book", "coin": self.symbol}}
 
-        for i in range(10):  # Simulate 10 price checks
-            price, bid, ask = self.get_price()
-            if price is None:
-                continue
-
-            timestamp = datetime.now().strftime("%H:%M:%S")
-
-            # Simple momentum strategy
-            if len(trades) == 0 or trades[-1]['action'] == 'SELL':
-                # Look to buy
-                if price < 1.8:  # Buy signal
-                    size = self.calculate_position_size(price)
-                    trades.append({
-                        'time': timestamp,
-                        'action': 'BUY',
-                        'price': price,
-                        'size': size,
-                        'value': size * price
-                    })
-                    print(f"📈 {timestamp} BUY {size:.4f} WIF at ${price:.6f} = ${size*price:.2f}")
-
-            elif trades[-1]['action'] == 'BUY':
-                # Look to sell
-                last_buy = trades[-1]
-                if price > last_buy['price'] * 1.02:  # 2% profit target
-                    trades.append({
-                        'time': timestamp,
-                        'action': 'SELL',
-                        'price': price,
-                        'size': last_buy['size'],
-                        'value': last_buy['size'] * price
-                    })
-                    profit = (price - last_buy['price']) * last_buy['size']
-                    portfolio_value += profit
-                    print(f"💰 {timestamp} SELL {last_buy['size']:.4f} WIF at ${price:.6f}")
-                    print(f"🎉 Profit: ${profit:.4f} | Portfolio: ${portfolio_value:.2f}")
-
-            time.sleep(2)  # Wait 2 seconds between checks
+        try:
+            # One persistent connection for the whole session
+            async with websockets.connect(self.ws_url) as ws:
+                await ws.send(json.dumps(subscribe))
+                last_price = None
+                seen = 0
+                loop = asyncio.get_running_loop()
+                # Idle means no price change, so unchanged-book pushes can't keep it alive
+                idle_deadline = loop.time() + self.stream_idle_timeout
+
+                while True:
+                    # Wake only on pushes, but never wait on a dead stream forever
+                    try:
+                        msg = await asyncio.wait_for(ws.recv(), timeout=max(0.0, idle_deadline - loop.time()))
+                    except asyncio.TimeoutError:
+                        print(f"⚠️  No price updates for {self.stream_idle_timeout}s - ending session")
+                        break
+
+                    update = json.loads(msg)
+                    if update.get('channel') != 'l2Book':
+                        continue
+
+                    price, bid, ask = self._parse_book(update['data'])
+                    # Only a real price change counts as a new check
+                    if price is None or price == last_price:
+                        continue
+                    last_price = price
+                    idle_deadline = loop.time() + self.stream_idle_timeout
+
+                    portfolio_value = self._paper_tick(trades, portfolio_value, price)
+
+                    seen += 1
+                    if seen >= checks:
+                        break
+        except Exception as e:
+            print(f"❌ Price stream error: {e}")
 
         print("\n" + "=" * 50)
         print(f"📊 PAPER TRADING COMPLETE")
@@ -162,27 +214,50 @@ class MicroTrader:
         print(f"📈 Total P&L: ${portfolio_value - self.capital:.2f}")
         print(f"📈 Return: {((portfolio_value - self.capital) / self.capital) * 100:.2f}%")
 
-def main():
+    def _paper_tick(self, trades, portfolio_value, price):
+        """Apply the paper strategy to one price update, returns the new portfolio value"""
+        ts = int(time.time())
+
+        # Simple momentum strategy
+        if len(trades) == 0 or trades[-1].action == 'SELL':
+            # Look to buy
+            if price < 1.8:  # Buy signal
+                size = self.calculate_position_size(price)
+                trades.append(Trade(ts, 'BUY', price, size, size * price))
+                print(f"📈 {time.strftime('%H:%M:%S', time.localtime(ts))} BUY {size:.4f} WIF at ${price:.6f} = ${size*price:.2f}")
+
+        elif trades[-1].action == 'BUY':
+            # Look to sell
+            last_buy = trades[-1]
+            if price > last_buy.price * 1.02:  # 2% profit target
+                trades.append(Trade(ts, 'SELL', price, last_buy.size, last_buy.size * price))
+                profit = (price - last_buy.price) * last_buy.size
+                portfolio_value += profit
+                print(f"💰 {time.strftime('%H:%M:%S', time.localtime(ts))} SELL {last_buy.size:.4f} WIF at ${price:.6f}")
+                print(f"🎉 Profit: ${profit:.4f} | Portfolio: ${portfolio_value:.2f}")
+
+        return portfolio_value
+
+async def main():
     print("🎯 $25 Hyperliquid Micro Trader")
     print("=" * 40)
 
-    trader = MicroTrader()
-
-    print("\n🔍 Testing API connectivity...")
-    price, bid, ask = trader.get_price()
+    async with MicroTrader() as trader:
+        print("\n🔍 Testing API connectivity...")
+        price, bid, ask = await trader.get_price()
 
-    if price:
-        print(f"✅ Connected to Hyperliquid!")
-        print(f"💡 WIF Current Price: ${price:.6f}")
+        if price:
+            print(f"✅ Connected to Hyperliquid!")
+            print(f"💡 WIF Current Price: ${price:.6f}")
 
-        print("\n📊 Running simulation...")
-        if trader.simulate_trade():
-            print("\n📝 Would you like to run paper trading? (y/n)")
-            # In real usage, you'd get user input here
-            print("📝 Running paper trading simulation...")
-            trader.run_paper_trading()
-    else:
-        print("❌ Failed to connect to Hyperliquid API")
+            print("\n📊 Running simulation...")
+            if await trader.simulate_trade():
+                print("\n📝 Would you like to run paper trading? (y/n)")
+                # In real usage, you'd get user input here
+                print("📝 Running paper trading simulation...")
+                await trader.run_paper_trading()
+        else:
+            print("❌ Failed to connect to Hyperliquid API")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -8,6 +8,7 @@ import os
 import getpass
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 def setup_hyperliquid_config():
     """Guide through Hyperliquid API setup"""
@@ -27,58 +28,63 @@ def setup_hyperliquid_config():
     # Discord webhook (optional)
     discord_webhook = input("📱 Discord Webhook URL (optional, press Enter to skip): ")
 
-    # Create config file
-    config_content = f'''# Hyperliquid API Configuration
-HYPERLIQUID_PRIVATE_KEY = "{private_key}"
-HYPERLIQUID_ADDRESS = "{address}"
-DISCORD_WEBHOOK_URL = "{discord_webhook}"
-
-# Trading Parameters for $25 capital
-TRADING_CONFIG = {{
-    "capital": 25.0,           # Your starting capital
-    "leverage": 10,            # Conservative leverage
-    "max_position_value": 250, # $25 * 10 leverage
-    "position_size_dollars": 5, # $5 per trade
-    "symbol": "WIF",           # Trading symbol
-    "stop_loss_pct": 0.05,     # 5% stop loss
-    "take_profit_pct": 0.10,   # 10% take profit
-    "max_daily_loss": 2.5,     # $2.5 max daily loss (10% of capital)
-}}
-
-# Risk Management
-RISK_LIMITS = {{
-    "max_positions": 1,        # Max open positions
-    "max_daily_trades": 10,    # Max trades per day
-    "emergency_stop": True,    # Enable emergency stop
-}}
-'''
-
-    # Write config file
-    with open('config_keys.py', 'w') as f:
-        f.write(config_content)
-
-    print("\n✅ Configuration saved to 'config_keys.py'")
+    # Create config file - plain JSON data, never generated Python source
+    config = {
+        "HYPERLIQUID_PRIVATE_KEY": private_key,
+        "HYPERLIQUID_ADDRESS": address,
+        "DISCORD_WEBHOOK_URL": discord_webhook,
+        # Trading Parameters for $25 capital
+        "TRADING_CONFIG": {
+            "capital": 25.0,             # Your starting capital
+            "leverage": 10,              # Conservative leverage
+            "max_position_value": 250,   # $25 * 10 leverage
+            "position_size_dollars": 5,  # $5 per trade
+            "symbol": "WIF",             # Trading symbol
+            "stop_loss_pct": 0.05,       # 5% stop loss
+            "take_profit_pct": 0.10,     # 10% take profit
+            "max_daily_loss": 2.5,       # $2.5 max daily loss (10% of capital)
+        },
+        # Risk Management
+        "RISK_LIMITS": {
+            "max_positions": 1,          # Max open positions
+            "max_daily_trades": 10,      # Max trades per day
+            "emergency_stop": True,      # Enable emergency stop
+        },
+    }
+
+    # Write config file, created owner-only so the key is never world-readable
+    fd = os.open('config_keys.json', os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(config, f, indent=2)
+    # O_CREAT's mode only applies to new files; tighten one left by an older setup
+    os.chmod('config_keys.json', 0o600)
+
+    print("\n✅ Configuration saved to 'config_keys.json'")
     return private_key, address
 
 def test_api_connection(private_key, address):
     """Test API connection"""
     print("\n🔍 Testing API connection...")
 
+    # One pooled session shared by both checks
+    session = requests.Session()
+    session.headers.update({'Content-Type': 'application/json'})
+    info_url = 'https://api.hyperliquid.xyz/info'
+    account_data = {"type": "clearinghouseState", "user": address}
+
     try:
-        # Test basic info endpoint
-        response = requests.post('https://api.hyperliquid.xyz/info',
-                               headers={'Content-Type': 'application/json'},
-                               data=json.dumps({'type': 'meta'}))
+        # Meta and account checks are independent - run them concurrently
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            meta_future = pool.submit(session.post, info_url, json={'type': 'meta'}, timeout=(1, 3))
+            account_future = pool.submit(session.post, info_url, json=account_data, timeout=(1, 3))
+            response = meta_future.result()
+            account_response = account_future.result()
 
+        # Test basic info endpoint
         if response.status_code == 200:
             print("✅ Hyperliquid API reachable")
 
             # Test account info
-            account_data = {"type": "clearinghouseState", "user": address}
-            account_response = requests.post('https://api.hyperliquid.xyz/info',
-                                           headers={'Content-Type': 'application/json'},
-                                           data=json.dumps(account_data))
-
             if account_response.status_code == 200:
                 account_info = account_response.json()
                 print("✅ Account accessible")
@@ -105,6 +111,8 @@ def test_api_connection(private_key, address):
     except Exception as e:
         print(f"❌ Connection error: {e}")
         return False
+    finally:
+        session.close()
 
 def safety_checklist():
     """Safety checklist before live trading"""
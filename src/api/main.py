@@ -2,19 +2,38 @@
 FastAPI Trading Engine - Unified API for all MoonDev strategies
 """
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+from collections import OrderedDict
 from decimal import Decimal
 import asyncio
-import json
+import hashlib
+import logging
+import msgspec
+import sys
 from datetime import datetime
 
 from src.utils.hyperliquid_client import HyperliquidClient, MarketData, Position
 from src.strategies.adapters.base import StrategyAdapter, StrategyConfig
-
-app = FastAPI(title="OpenAlgo Trading Engine", version="1.0.0")
+from src.strategies.adapters.turtle import TurtleAdapter
+from src.strategies.adapters.consolidation import ConsolidationAdapter
+from src.strategies.adapters.nadarya import NadaryaAdapter
+from src.strategies.adapters.correlation import CorrelationAdapter
+from src.strategies.adapters.market_maker import MarketMakerAdapter
+from src.strategies.adapters.mean_reversion import MeanReversionAdapter
+from src.strategies.adapters.solana_sniper import SolanaSniperAdapter
+from src.strategies.adapters.arbitrage import ArbitrageAdapter
+
+logger = logging.getLogger(__name__)
+
+app = FastAPI(
+    title="OpenAlgo Trading Engine",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -45,9 +64,197 @@ class StrategyInfo(BaseModel):
     default_params: Dict[str, Any]
 
 
+# Hot-path responses are msgspec Structs encoded straight to bytes, skipping
+# FastAPI's jsonable_encoder pass over plain dicts
+class PositionResp(msgspec.Struct):
+    symbol: str
+    size: float
+    side: str
+    entry_price: float
+    mark_price: float
+    unrealized_pnl: float
+    leverage: float
+
+
+class PortfolioResp(msgspec.Struct):
+    wallet: str
+    account_value: float
+    available_balance: float
+    positions: List[PositionResp]
+
+
+json_encoder = msgspec.json.Encoder()
+
+
+# Static per deploy - built and serialized once at import
+STRATEGIES: List[StrategyInfo] = [
+    StrategyInfo(
+        id="turtle_trending",
+        name="Turtle Trending",
+        description="55-bar breakout strategy with 2x ATR stop loss",
+        timeframe_options=["1m", "5m", "15m", "1h", "4h"],
+        default_params={"take_profit": 0.2, "atr_multiplier": 2},
+    ),
+    StrategyInfo(
+        id="consolidation_pop",
+        name="Consolidation Pop",
+        description="Range trading - buy low 1/3 of consolidation",
+        timeframe_options=["1m", "3m", "5m", "15m", "1h"],
+        default_params={
+            "take_profit": 0.3,
+            "stop_loss": 0.25,
+            "consolidation_bars": 10,
+        },
+    ),
+    StrategyInfo(
+        id="nadarya_watson",
+        name="Nadarya-Watson",
+        description="Stoch RSI + Nadarya signals for high-probability entries",
+        timeframe_options=["1h", "4h", "1d"],
+        default_params={"rsi_window": 14, "oversold": 10, "overbought": 90},
+    ),
+    StrategyInfo(
+        id="correlation",
+        name="Correlation Arbitrage",
+        description="Cross-asset correlation statistical arbitrage",
+        timeframe_options=["5m", "15m", "1h"],
+        default_params={"correlation_threshold": 0.8, "lookback": 100},
+    ),
+    StrategyInfo(
+        id="market_maker",
+        name="Market Maker",
+        description="Order book microstructure spread capture",
+        timeframe_options=["1m", "5m"],
+        default_params={"spread_target": 0.1, "max_position": 1000},
+    ),
+    StrategyInfo(
+        id="mean_reversion",
+        name="Mean Reversion",
+        description="74-ticker universe oversold bounce strategy",
+        timeframe_options=["15m", "1h", "4h"],
+        default_params={"zscore_threshold": -2.0, "lookback": 50},
+    ),
+    StrategyInfo(
+        id="solana_sniper",
+        name="Solana Sniper",
+        description="New token launch sniper with anti-rug security filters",
+        timeframe_options=["1m", "5m", "15m"],
+        default_params={
+            "hours_to_look": 0.2,
+            "max_market_cap": 30000,
+            "max_top10_percent": 0.7,
+            "min_liquidity": 400,
+            "min_trades_1h": 9,
+            "min_unique_wallets": 30,
+        },
+    ),
+    StrategyInfo(
+        id="arbitrage",
+        name="High-Frequency Arbitrage",
+        description="Triangular and statistical arbitrage with sub-100ms execution",
+        timeframe_options=["1s", "5s", "15s", "1m"],
+        default_params={
+            "min_profit_pct": 0.1,
+            "max_slippage": 0.05,
+            "base_size": 1000,
+        },
+    ),
+]
+STRATEGIES_JSON = json_encoder.encode([s.model_dump() for s in STRATEGIES])
+STRATEGIES_ETAG = f'"{hashlib.sha256(STRATEGIES_JSON).hexdigest()}"'
+STRATEGIES_HEADERS = {"ETag": STRATEGIES_ETAG, "Cache-Control": "public, max-age=3600"}
+
+
 active_strategies: Dict[str, StrategyAdapter] = {}
 connected_clients: List[WebSocket] = []
 
+# How often the broadcaster drains strategy updates
+BROADCAST_INTERVAL = 0.05
+_broadcast_task: Optional[asyncio.Task] = None
+
+# One client per wallet keeps its connection pool warm across requests
+MAX_CACHED_CLIENTS = 128
+_client_cache: "OrderedDict[Tuple[str, bool], HyperliquidClient]" = OrderedDict()
+
+
+def get_client(wallet_address: str, private_key: str, sandbox: bool) -> HyperliquidClient:
+    """Return the cached client for a wallet, creating it on first use"""
+    key = (wallet_address, sandbox)
+    client = _client_cache.get(key)
+    # A different secret never reuses another caller's authenticated client
+    if client is None or client.private_key != private_key:
+        client = HyperliquidClient(
+            wallet_address=wallet_address, private_key=private_key, sandbox=sandbox
+        )
+        _client_cache[key] = client
+    _client_cache.move_to_end(key)
+
+    # Evicted clients are only dropped from the cache, not disconnected -
+    # a running strategy adapter may still hold them
+    while len(_client_cache) > MAX_CACHED_CLIENTS:
+        _client_cache.popitem(last=False)
+
+    return client
+
+
+async def _send_or_drop(websocket: WebSocket, message: Dict[str, Any]):
+    """Send to one client, dropping it if the connection is dead"""
+    try:
+        await websocket.send_json(message)
+    except Exception:
+        if websocket in connected_clients:
+            connected_clients.remove(websocket)
+
+
+async def broadcast_loop():
+    """Drain each strategy's updates once and fan them out to every client"""
+    while True:
+        for strategy_key, adapter in list(active_strategies.items()):
+            # One failing strategy must not end the broadcast for every client
+            try:
+                updates = adapter.get_updates()
+                if updates and connected_clients:
+                    message = {
+                        "timestamp": datetime.utcnow().isoformat(),
+                        "strategy": strategy_key,
+                        "updates": updates,
+                    }
+                    await asyncio.gather(
+                        *(_send_or_drop(ws, message) for ws in list(connected_clients))
+                    )
+            except Exception:
+                logger.exception(f"Broadcast failed for {strategy_key}")
+        await asyncio.sleep(BROADCAST_INTERVAL)
+
+
+def _log_broadcast_exit(task: asyncio.Task):
+    """Report a broadcaster that stopped for any reason other than shutdown"""
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.error("Broadcast loop stopped", exc_info=exc)
+
+
+@app.on_event("startup")
+async def start_broadcaster():
+    global _broadcast_task
+    _broadcast_task = asyncio.create_task(broadcast_loop())
+    _broadcast_task.add_done_callback(_log_broadcast_exit)
+
+
+@app.on_event("shutdown")
+async def stop_broadcaster():
+    if _broadcast_task:
+        _broadcast_task.cancel()
+
+
+@app.on_event("shutdown")
+async def close_clients():
+    clients = list(_client_cache.values())
+    _client_cache.clear()
+    await asyncio.gather(*(c.disconnect() for c in clients), return_exceptions=True)
+
 
 @app.get("/")
 async def root():
@@ -55,92 +262,28 @@ async def root():
 
 
 @app.get("/strategies", response_model=List[StrategyInfo])
-async def list_strategies():
+async def list_strategies(request: Request):
     """List all available trading strategies"""
-    return [
-        StrategyInfo(
-            id="turtle_trending",
-            name="Turtle Trending",
-            description="55-bar breakout strategy with 2x ATR stop loss",
-            timeframe_options=["1m", "5m", "15m", "1h", "4h"],
-            default_params={"take_profit": 0.2, "atr_multiplier": 2},
-        ),
-        StrategyInfo(
-            id="consolidation_pop",
-            name="Consolidation Pop",
-            description="Range trading - buy low 1/3 of consolidation",
-            timeframe_options=["1m", "3m", "5m", "15m", "1h"],
-            default_params={
-                "take_profit": 0.3,
-                "stop_loss": 0.25,
-                "consolidation_bars": 10,
-            },
-        ),
-        StrategyInfo(
-            id="nadarya_watson",
-            name="Nadarya-Watson",
-            description="Stoch RSI + Nadarya signals for high-probability entries",
-            timeframe_options=["1h", "4h", "1d"],
-            default_params={"rsi_window": 14, "oversold": 10, "overbought": 90},
-        ),
-        StrategyInfo(
-            id="correlation",
-            name="Correlation Arbitrage",
-            description="Cross-asset correlation statistical arbitrage",
-            timeframe_options=["5m", "15m", "1h"],
-            default_params={"correlation_threshold": 0.8, "lookback": 100},
-        ),
-        StrategyInfo(
-            id="market_maker",
-            name="Market Maker",
-            description="Order book microstructure spread capture",
-            timeframe_options=["1m", "5m"],
-            default_params={"spread_target": 0.1, "max_position": 1000},
-        ),
-        StrategyInfo(
-            id="mean_reversion",
-            name="Mean Reversion",
-            description="74-ticker universe oversold bounce strategy",
-            timeframe_options=["15m", "1h", "4h"],
-            default_params={"zscore_threshold": -2.0, "lookback": 50},
-        ),
-        StrategyInfo(
-            id="solana_sniper",
-            name="Solana Sniper",
-            description="New token launch sniper with anti-rug security filters",
-            timeframe_options=["1m", "5m", "15m"],
-            default_params={
-                "hours_to_look": 0.2,
-                "max_market_cap": 30000,
-                "max_top10_percent": 0.7,
-                "min_liquidity": 400,
-                "min_trades_1h": 9,
-                "min_unique_wallets": 30,
-            },
-        ),
-        StrategyInfo(
-            id="arbitrage",
-            name="High-Frequency Arbitrage",
-            description="Triangular and statistical arbitrage with sub-100ms execution",
-            timeframe_options=["1s", "5s", "15s", "1m"],
-            default_params={
-                "min_profit_pct": 0.1,
-                "max_slippage": 0.05,
-                "base_size": 1000,
-            },
-        ),
-    ]
+    # Warm clients revalidate with the ETag and skip the body
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or STRATEGIES_ETAG in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers=STRATEGIES_HEADERS)
+
+    return Response(
+        content=STRATEGIES_JSON,
+        media_type="application/json",
+        headers=STRATEGIES_HEADERS,
+    )
 
 
 @app.post("/strategy/start")
 async def start_strategy(request: TradingRequest):
     """Start a trading strategy"""
     try:
-        client = HyperliquidClient(
-            wallet_address=request.api_key,
-            private_key=request.api_secret,
-            sandbox=request.sandbox,
-        )
+        client = get_client(request.api_key, request.api_secret, request.sandbox)
 
         config = StrategyConfig(
             strategy_id=request.strategy_id,
@@ -185,30 +328,30 @@ async def stop_strategy(strategy_key: str):
 async def get_portfolio(wallet_address: str, api_secret: str, sandbox: bool = True):
     """Get current portfolio state"""
     try:
-        client = HyperliquidClient(
-            wallet_address=wallet_address, private_key=api_secret, sandbox=sandbox
-        )
+        client = get_client(wallet_address, api_secret, sandbox)
 
         positions = await client.get_positions()
         account = await client.get_account_info()
 
-        return {
-            "wallet": wallet_address,
-            "account_value": float(account["account_value"]),
-            "available_balance": float(account["available_balance"]),
-            "positions": [
-                {
-                    "symbol": p.symbol,
-                    "size": float(p.size),
-                    "side": p.side,
-                    "entry_price": float(p.entry_price),
-                    "mark_price": float(p.mark_price),
-                    "unrealized_pnl": float(p.unrealized_pnl),
-                    "leverage": float(p.leverage),
-                }
+        f = float
+        resp = PortfolioResp(
+            wallet=wallet_address,
+            account_value=f(account["account_value"]),
+            available_balance=f(account["available_balance"]),
+            positions=[
+                PositionResp(
+                    symbol=p.symbol,
+                    size=f(p.size),
+                    side=p.side,
+                    entry_price=f(p.entry_price),
+                    mark_price=f(p.mark_price),
+                    unrealized_pnl=f(p.unrealized_pnl),
+                    leverage=f(p.leverage),
+                )
                 for p in positions
             ],
-        }
+        )
+        return Response(json_encoder.encode(resp), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -222,9 +365,7 @@ async def kill_switch(
 ):
     """Emergency kill switch - close all positions"""
     try:
-        client = HyperliquidClient(
-            wallet_address=wallet_address, private_key=api_secret, sandbox=sandbox
-        )
+        client = get_client(wallet_address, api_secret, sandbox)
 
         result = await client.kill_switch(symbol)
 
@@ -240,56 +381,55 @@ async def kill_switch(
 
 @app.websocket("/ws/trades")
 async def websocket_trades(websocket: WebSocket):
-    """WebSocket for real-time trade updates"""
+    """WebSocket for real-time trade updates (pushed by broadcast_loop)"""
     await websocket.accept()
     connected_clients.append(websocket)
 
     try:
+        # Only listen for the disconnect; updates are pushed by the broadcaster
         while True:
-            for strategy_key, adapter in active_strategies.items():
-                updates = adapter.get_updates()
-                if updates:
-                    await websocket.send_json(
-                        {
-                            "timestamp": datetime.utcnow().isoformat(),
-                            "strategy": strategy_key,
-                            "updates": updates,
-                        }
-                    )
-            await asyncio.sleep(1)
+            await websocket.receive_text()
     except WebSocketDisconnect:
-        connected_clients.remove(websocket)
+        pass
+    finally:
+        if websocket in connected_clients:
+            connected_clients.remove(websocket)
+
+
+ADAPTERS: Dict[str, type] = {
+    "turtle_trending": TurtleAdapter,
+    "consolidation_pop": ConsolidationAdapter,
+    "nadarya_watson": NadaryaAdapter,
+    "correlation": CorrelationAdapter,
+    "market_maker": MarketMakerAdapter,
+    "mean_reversion": MeanReversionAdapter,
+    "solana_sniper": SolanaSniperAdapter,
+    "arbitrage": ArbitrageAdapter,
+}
 
 
 def get_strategy_adapter(strategy_id: str):
     """Get the strategy adapter class by ID"""
-    from src.strategies.adapters.turtle import TurtleAdapter
-    from src.strategies.adapters.consolidation import ConsolidationAdapter
-    from src.strategies.adapters.nadarya import NadaryaAdapter
-    from src.strategies.adapters.correlation import CorrelationAdapter
-    from src.strategies.adapters.market_maker import MarketMakerAdapter
-    from src.strategies.adapters.mean_reversion import MeanReversionAdapter
-    from src.strategies.adapters.solana_sniper import SolanaSniperAdapter
-    from src.strategies.adapters.arbitrage import ArbitrageAdapter
-
-    adapters = {
-        "turtle_trending": TurtleAdapter,
-        "consolidation_pop": ConsolidationAdapter,
-        "nadarya_watson": NadaryaAdapter,
-        "correlation": CorrelationAdapter,
-        "market_maker": MarketMakerAdapter,
-        "mean_reversion": MeanReversionAdapter,
-        "solana_sniper": SolanaSniperAdapter,
-        "arbitrage": ArbitrageAdapter,
-    }
-
-    if strategy_id not in adapters:
-        raise ValueError(f"Unknown strategy: {strategy_id}")
-
-    return adapters[strategy_id]
+    try:
+        return ADAPTERS[strategy_id]
+    except KeyError:
+        raise ValueError(f"Unknown strategy: {strategy_id}") from None
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Keep a single worker: active_strategies and connected_clients are
+    # per-process state. httptools cuts HTTP parsing overhead.
+    config = uvicorn.Config(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets",
+        workers=1,
+    )
+
+    # uvloop (asyncio on Windows) is set up by uvicorn itself
+    uvicorn.Server(config).run()
@@ -5,31 +5,119 @@ trading events, market conditions, and strategy outcomes.
 """
 
 import sqlite3
-import json
+import msgpack
+import orjson
 import logging
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Iterable, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Attributes are msgpack maps stored as BLOBs. Merges with the stored map happen
+# in Python, so the upserts simply overwrite with the already-merged blob.
+EMPTY_ATTRS = msgpack.packb({}, use_bin_type=True)
+
+# Fixed statement text so sqlite3's statement cache reuses the compiled plans
+UPSERT_NODE_SQL = """
+    INSERT INTO nodes (id, type, attributes, last_seen)
+    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(id) DO UPDATE SET
+        attributes = excluded.attributes,
+        last_seen = CURRENT_TIMESTAMP
+"""
+
+# Placeholder for an edge endpoint; never touches an existing node's type/attributes
+ENSURE_NODE_SQL = "INSERT OR IGNORE INTO nodes (id, type, attributes) VALUES (?, 'Unknown', ?)"
+
+UPSERT_EDGE_SQL = """
+    INSERT INTO edges (source_id, target_id, relation, weight, attributes)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(source_id, target_id, relation) DO UPDATE SET
+        weight = excluded.weight,
+        attributes = excluded.attributes
+"""
+
+NODE_ATTRS_SQL = "SELECT attributes FROM nodes WHERE id = ?"
+
+EDGE_ATTRS_SQL = """
+    SELECT attributes FROM edges
+    WHERE source_id = ? AND target_id = ? AND relation = ?
+"""
+
+RELATIONSHIPS_SQL = """
+    SELECT target_id, relation, weight, nodes.type AS target_type, nodes.attributes AS target_attrs
+    FROM edges
+    JOIN nodes ON edges.target_id = nodes.id
+    WHERE source_id = ?
+"""
+
+RELATIONSHIPS_BY_RELATION_SQL = RELATIONSHIPS_SQL + "    AND relation = ?\n"
+
 
 class KnowledgeGraph:
     def __init__(self, db_path: str = "data/memory/kairos_graph.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # One long-lived connection; transactions are managed explicitly
+        self.conn = sqlite3.connect(
+            self.db_path, isolation_level=None, check_same_thread=False
+        )
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA mmap_size=268435456")
+
+        # The connection is shared across threads (FastAPI runs sync work in a pool)
+        self._lock = threading.RLock()
+        self._tx_depth = 0
+
         self._init_db()
 
+    def analyze(self):
+        """Refresh planner statistics, e.g. after a bulk import"""
+        with self._lock:
+            self.conn.execute("ANALYZE")
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            # Lets SQLite re-analyze tables whose statistics have drifted
+            self.conn.execute("PRAGMA optimize")
+            self.conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in one transaction; nested calls join the outer one"""
+        with self._lock:
+            if self._tx_depth == 0:
+                self.conn.execute("BEGIN")
+            self._tx_depth += 1
+            try:
+                yield self.conn
+            except BaseException:
+                self._tx_depth -= 1
+                if self._tx_depth == 0:
+                    self.conn.execute("ROLLBACK")
+                raise
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                self.conn.execute("COMMIT")
+
     def _init_db(self):
         """Initialize the Graph Schema (Nodes and Edges)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
 
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS nodes (
                     id TEXT PRIMARY KEY,
                     type TEXT NOT NULL,
-                    attributes JSON,
+                    attributes BLOB,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
@@ -41,31 +129,71 @@ class KnowledgeGraph:
                     target_id TEXT,
                     relation TEXT,
                     weight REAL DEFAULT 1.0,
-                    attributes JSON,
+                    attributes BLOB,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     PRIMARY KEY (source_id, target_id, relation),
                     FOREIGN KEY(source_id) REFERENCES nodes(id),
                     FOREIGN KEY(target_id) REFERENCES nodes(id)
                 )
             """)
-            conn.commit()
 
-    def add_node(self, node_id: str, node_type: str, attributes: Dict[str, Any] = None):
-        """Create or update a node in the graph"""
-        attr_json = json.dumps(attributes or {})
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+            # query_relationships filters on source_id (+ relation) and joins on target_id
             cursor.execute(
-                """
-                INSERT INTO nodes (id, type, attributes, last_seen)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(id) DO UPDATE SET
-                    attributes = json_patch(attributes, ?),
-                    last_seen = CURRENT_TIMESTAMP
-            """,
-                (node_id, node_type, attr_json, attr_json),
+                "CREATE INDEX IF NOT EXISTS idx_edges_src_rel ON edges(source_id, relation)"
             )
-            conn.commit()
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_edges_tgt ON edges(target_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_nodes_type ON nodes(type)")
+
+    @staticmethod
+    def _unpack_attrs(blob) -> Dict[str, Any]:
+        """Decode a stored attributes value"""
+        if blob is None:
+            return {}
+        # Databases written before the BLOB switch hold JSON text
+        if isinstance(blob, str):
+            return orjson.loads(blob)
+        return msgpack.unpackb(blob, raw=False)
+
+    def _merge_attrs(
+        self, pending: Dict[tuple, Dict[str, Any]], sql: str, key: tuple,
+        attributes: Optional[Dict[str, Any]],
+    ) -> bytes:
+        """Merge attributes into the stored (or pending) map for key, return the packed result"""
+        merged = pending.get(key)
+        if merged is None:
+            row = self.conn.execute(sql, key).fetchone()
+            merged = self._unpack_attrs(row[0]) if row else {}
+            pending[key] = merged
+        if attributes:
+            merged.update(attributes)
+        return msgpack.packb(merged, use_bin_type=True)
+
+    def _write(
+        self,
+        nodes: Iterable[Tuple[str, str, Optional[Dict[str, Any]]]],
+        edges: Iterable[Tuple[str, str, str, float, Optional[Dict[str, Any]]]],
+    ):
+        """Upsert nodes then edges in one transaction, merging attributes in Python"""
+        with self._transaction() as conn:
+            pending: Dict[tuple, Dict[str, Any]] = {}
+            node_rows = [
+                (node_id, node_type,
+                 self._merge_attrs(pending, NODE_ATTRS_SQL, (node_id,), attributes))
+                for node_id, node_type, attributes in nodes
+            ]
+            conn.executemany(UPSERT_NODE_SQL, node_rows)
+
+            pending = {}
+            edge_rows = [
+                (source_id, target_id, relation, weight,
+                 self._merge_attrs(pending, EDGE_ATTRS_SQL, (source_id, target_id, relation), attributes))
+                for source_id, target_id, relation, weight, attributes in edges
+            ]
+            conn.executemany(UPSERT_EDGE_SQL, edge_rows)
+
+    def add_node(self, node_id: str, node_type: str, attributes: Dict[str, Any] = None):
+        """Create or update a node in the graph"""
+        self._write([(node_id, node_type, attributes)], [])
 
     def add_edge(
         self,
@@ -76,46 +204,55 @@ class KnowledgeGraph:
         attributes: Dict[str, Any] = None,
     ):
         """Create or update a relationship between nodes"""
-        attr_json = json.dumps(attributes or {})
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            self.add_node(source_id, "Unknown")
-            self.add_node(target_id, "Unknown")
-
-            cursor.execute(
-                """
-                INSERT INTO edges (source_id, target_id, relation, weight, attributes)
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(source_id, target_id, relation) DO UPDATE SET
-                    weight = ?,
-                    attributes = json_patch(attributes, ?)
-            """,
-                (source_id, target_id, relation, weight, attr_json, weight, attr_json),
+        with self._transaction() as conn:
+            conn.executemany(
+                ENSURE_NODE_SQL, ((source_id, EMPTY_ATTRS), (target_id, EMPTY_ATTRS))
             )
-            conn.commit()
+            self._write([], [(source_id, target_id, relation, weight, attributes)])
 
     def query_relationships(
         self, node_id: str, relation: Optional[str] = None
     ) -> List[Dict]:
         """Find what a node is connected to"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+        # Rows are fetched under the lock: the memory writer thread shares self.conn
+        with self._lock:
+            if relation is None:
+                rows = self.conn.execute(RELATIONSHIPS_SQL, (node_id,)).fetchall()
+            else:
+                rows = self.conn.execute(
+                    RELATIONSHIPS_BY_RELATION_SQL, (node_id, relation)
+                ).fetchall()
+        unpack = self._unpack_attrs
+        return [{**dict(row), "target_attrs": unpack(row["target_attrs"])} for row in rows]
 
-            query = """
-                SELECT target_id, relation, weight, nodes.type as target_type, nodes.attributes as target_attrs
-                FROM edges 
-                JOIN nodes ON edges.target_id = nodes.id
-                WHERE source_id = ?
-            """
-            params = [node_id]
+    @staticmethod
+    def _trade_event_rows(
+        strategy: str,
+        symbol: str,
+        action: str,
+        price: float,
+        conditions: Dict[str, Any],
+    ) -> Tuple[List[tuple], List[tuple]]:
+        """Node and edge tuples (as taken by _write) for one trade event"""
+        strat_node = f"Strategy:{strategy}"
+        asset_node = f"Asset:{symbol}"
+        event_node = f"Event:{action}_{symbol}_{int(datetime.now().timestamp())}"
 
-            if relation:
-                query += " AND relation = ?"
-                params.append(relation)
+        nodes = [
+            (strat_node, "Strategy", {"status": "active"}),
+            (asset_node, "Asset", {"symbol": symbol}),
+            (event_node, "TradeEvent", {"action": action, "price": price}),
+        ]
+        edges = [
+            (strat_node, event_node, "EXECUTED", 1.0, None),
+            (event_node, asset_node, "TRADED_ON", 1.0, None),
+        ]
+        for cond, val in conditions.items():
+            cond_node = f"Condition:{cond}_{val}"
+            nodes.append((cond_node, "MarketCondition", {"value": val}))
+            edges.append((cond_node, event_node, "INFLUENCED", 1.0, None))
 
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+        return nodes, edges
 
     def log_trade_event(
         self,
@@ -126,23 +263,22 @@ class KnowledgeGraph:
         conditions: Dict[str, Any],
     ):
         """Semantic logging of a trade event"""
+        self.log_trade_events([(strategy, symbol, action, price, conditions)])
 
-        strat_node = f"Strategy:{strategy}"
-        asset_node = f"Asset:{symbol}"
-        event_node = f"Event:{action}_{symbol}_{int(datetime.now().timestamp())}"
-
-        self.add_node(strat_node, "Strategy", {"status": "active"})
-        self.add_node(asset_node, "Asset", {"symbol": symbol})
-        self.add_node(event_node, "TradeEvent", {"action": action, "price": price})
-
-        for cond, val in conditions.items():
-            cond_node = f"Condition:{cond}_{val}"
-            self.add_node(cond_node, "MarketCondition", {"value": val})
-            self.add_edge(cond_node, event_node, "INFLUENCED")
-
-        self.add_edge(strat_node, event_node, "EXECUTED")
-        self.add_edge(event_node, asset_node, "TRADED_ON")
+    def log_trade_events(
+        self, events: Iterable[Tuple[str, str, str, float, Dict[str, Any]]]
+    ):
+        """Log several (strategy, symbol, action, price, conditions) events in one transaction"""
+        nodes: List[tuple] = []
+        edges: List[tuple] = []
+        for event in events:
+            event_nodes, event_edges = self._trade_event_rows(*event)
+            nodes.extend(event_nodes)
+            edges.extend(event_edges)
+            logger.info(
+                f"🧠 Graph Memory Encoded: {event_nodes[0][0]} -> {event_nodes[2][0]} -> {event_nodes[1][0]}"
+            )
 
-        logger.info(
-            f"🧠 Graph Memory Encoded: {strat_node} -> {event_node} -> {asset_node}"
-        )
+        # Every node is inserted above, so edges need no placeholder nodes.
+        # One executemany per table, all in a single transaction.
+        self._write(nodes, edges)
@@ -3,19 +3,30 @@ KAIROS Memory Manager
 The hippocampus of the trading system. Persists experience to drive future intelligence.
 """
 
-import json
+import atexit
 import logging
+import numpy as np
+import orjson
+import pyarrow as pa
+import queue
+import threading
 import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 
 from src.brain.knowledge_graph import KnowledgeGraph
 
 logger = logging.getLogger(__name__)
 
+# Tells the writer thread to exit once everything before it is written
+_STOP = object()
 
-@dataclass
+# Upper bound on trades coalesced into one append + stats write
+WRITE_BATCH_MAX = 256
+
+
+@dataclass(slots=True)
 class TradeMemory:
     timestamp: float
     strategy: str
@@ -33,95 +44,301 @@ class MemoryManager:
     def __init__(self, data_dir: str = "data/memory"):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        self.memory_file = self.data_dir / "trade_history.json"
+        # Append-only log: one JSON object per line, one line per trade
+        self.memory_file = self.data_dir / "trade_history.jsonl"
+        self.legacy_memory_file = self.data_dir / "trade_history.json"
+        # Arrow IPC snapshot of the analytics columns: a startup cache so only the
+        # log tail written since it needs parsing. Rewritten on load and on close()
+        self.snapshot_file = self.data_dir / "trade_history.arrow"
         self.stats_file = self.data_dir / "strategy_stats.json"
 
+        # Full TradeMemory records are only parsed if someone reads self.trades
+        self._trades: Optional[List[TradeMemory]] = None
+        # Set if a log append fails, so close() won't snapshot columns the log lacks
+        self._log_write_failed = False
+
+        # get_intelligence results per strategy; log_trade marks its strategy dirty
+        self._intel_cache: Dict[str, Dict[str, Any]] = {}
+        self._intel_dirty: set = set()
+
         self.graph = KnowledgeGraph(str(self.data_dir / "kairos_graph.db"))
         self._load_memory()
+        self._rebuild_stats()
+
+        # Disk and graph writes happen on a background thread so log_trade never blocks on I/O
+        self._stats_lock = threading.Lock()
+        self._write_q: "queue.Queue[Any]" = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._flush_worker, name="memory-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
+
+    @property
+    def trades(self) -> List[TradeMemory]:
+        """Full trade history, read from the log on first access"""
+        if self._trades is None:
+            self.flush()
+            self._trades = self._read_log(0)[0]
+        return self._trades
 
     def _load_memory(self):
         """Load persistent memory"""
-        if self.memory_file.exists():
-            try:
-                with open(self.memory_file, "r") as f:
-                    self.trades = [TradeMemory(**t) for t in json.load(f)]
-            except Exception as e:
-                logger.error(f"Failed to load memory: {e}")
-                self.trades = []
-        else:
-            self.trades = []
+        if not self.memory_file.exists() and self.legacy_memory_file.exists():
+            self._migrate_legacy_memory()
+
+        strategies, pnl, vol, offset = self._load_snapshot()
+        self._init_columns(strategies, pnl, vol)
 
-    def _save_memory(self):
-        """Persist memory to disk"""
+        # Only log lines written after the snapshot need parsing
+        tail, end = self._read_log(offset)
+        for trade in tail:
+            self._append_columns(trade)
+        if tail:
+            self._save_snapshot(end)
+
+    def _read_log(self, offset: int) -> Tuple[List[TradeMemory], int]:
+        """Parse the trade log from a byte offset, returns (trades, end offset)"""
+        if not self.memory_file.exists():
+            return [], 0
         try:
-            with open(self.memory_file, "w") as f:
-                json.dump([asdict(t) for t in self.trades], f, indent=2)
+            with open(self.memory_file, "rb") as f:
+                f.seek(offset)
+                trades = [TradeMemory(**orjson.loads(line)) for line in f if line.strip()]
+                return trades, f.tell()
         except Exception as e:
+            logger.error(f"Failed to load memory: {e}")
+            return [], offset
+
+    def _load_snapshot(self) -> Tuple[list, Any, Any, int]:
+        """Map the Arrow snapshot, returns (strategies, pnl, volatility_atr, log offset)"""
+        empty = ([], np.empty(0), np.empty(0), 0)
+        if not self.snapshot_file.exists() or not self.memory_file.exists():
+            return empty
+        try:
+            # Mapped read; the columns are then copied into the growable arrays
+            # that log_trade appends to, so nothing stays backed by the file
+            source = pa.memory_map(str(self.snapshot_file), "r")
+            table = pa.ipc.open_file(source).read_all()
+            offset = int(table.schema.metadata[b"log_offset"])
+            # A log shorter than the snapshot was replaced; rebuild from scratch
+            if offset > self.memory_file.stat().st_size:
+                return empty
+            return (
+                table.column("strategy").to_pylist(),
+                table.column("pnl").to_numpy(),
+                table.column("volatility_atr").to_numpy(),
+                offset,
+            )
+        except Exception as e:
+            logger.error(f"Failed to load memory snapshot: {e}")
+            return empty
+
+    def _save_snapshot(self, log_offset: int):
+        """Write the analytics columns as an Arrow IPC file covering the log up to log_offset"""
+        n = self._size
+        table = pa.table(
+            {
+                "strategy": pa.array(self._strategy_col[:n].tolist(), pa.string()),
+                "pnl": pa.array(self._pnl_col[:n]),
+                "volatility_atr": pa.array(self._vol_col[:n]),
+            },
+            metadata={"log_offset": str(log_offset)},
+        )
+        tmp = self.snapshot_file.with_suffix(".arrow.tmp")
+        try:
+            with pa.OSFile(str(tmp), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            tmp.replace(self.snapshot_file)
+        except Exception as e:
+            logger.error(f"Failed to save memory snapshot: {e}")
+
+    def _migrate_legacy_memory(self):
+        """Convert a trade_history.json array into the JSONL log"""
+        try:
+            trades = orjson.loads(self.legacy_memory_file.read_bytes())
+            with open(self.memory_file, "wb") as f:
+                f.writelines(orjson.dumps(t) + b"\n" for t in trades)
+        except Exception as e:
+            logger.error(f"Failed to migrate memory: {e}")
+
+    def _save_memory(self, trades: List[TradeMemory]):
+        """Persist new trades to disk"""
+        try:
+            # Appends just these trades, in one write, instead of rewriting the history
+            with open(self.memory_file, "ab") as f:
+                f.write(b"".join(orjson.dumps(asdict(t)) + b"\n" for t in trades))
+        except Exception as e:
+            self._log_write_failed = True
             logger.error(f"Failed to save memory: {e}")
 
+    def _flush_worker(self):
+        """Drain the write queue, coalescing whatever is pending into one write"""
+        while True:
+            batch = [self._write_q.get()]
+            while len(batch) < WRITE_BATCH_MAX:
+                try:
+                    batch.append(self._write_q.get_nowait())
+                except queue.Empty:
+                    break
+
+            trades = [t for t in batch if t is not _STOP]
+            if trades:
+                self._save_memory(trades)
+                self._save_stats()
+                self._save_graph_events(trades)
+            for _ in batch:
+                self._write_q.task_done()
+            if len(trades) < len(batch):
+                return
+
+    def _save_graph_events(self, trades: List[TradeMemory]):
+        """Encode trades into the knowledge graph in one batch"""
+        try:
+            self.graph.log_trade_events(
+                (
+                    t.strategy,
+                    t.symbol,
+                    f"TRADE_{t.side.upper()}",
+                    t.entry_price,
+                    t.market_conditions,
+                )
+                for t in trades
+            )
+            # Insights computed before the graph caught up must be recomputed
+            self._intel_dirty.update(t.strategy for t in trades)
+        except Exception as e:
+            logger.error(f"Failed to save graph events: {e}")
+
+    def flush(self):
+        """Block until every logged trade has been written"""
+        if self._writer.is_alive():
+            self._write_q.join()
+
+    def close(self):
+        """Write out pending trades, stop the writer thread and refresh the snapshot"""
+        if self._writer.is_alive():
+            self._write_q.put(_STOP)
+            self._writer.join()
+            # The columns now match the whole log, so the next start parses no tail
+            if not self._log_write_failed and self.memory_file.exists():
+                self._save_snapshot(self.memory_file.stat().st_size)
+
     def log_trade(self, trade: TradeMemory):
         """Commit a new experience to long-term memory"""
-        self.trades.append(trade)
-        self._save_memory()
-        self._update_stats()
-
-        self.graph.log_trade_event(
-            strategy=trade.strategy,
-            symbol=trade.symbol,
-            action=f"TRADE_{trade.side.upper()}",
-            price=trade.entry_price,
-            conditions=trade.market_conditions,
-        )
+        if self._trades is not None:
+            self._trades.append(trade)
+        self._append_columns(trade)
+        self._intel_dirty.add(trade.strategy)
+        self._update_stats(trade)
+        # Log, stats and graph writes all happen on the writer thread
+        self._write_q.put(trade)
 
         logger.info(
             f"🧠 KAIROS learned from trade: {trade.strategy} on {trade.symbol} (PnL: {trade.pnl_percent}%)"
         )
 
-    def _update_stats(self):
+    def _init_columns(self, strategies: list, pnl, vol):
+        """Lay out the analytics fields as parallel arrays with room to grow"""
+        n = len(strategies)
+        capacity = max(1024, 1 << n.bit_length())
+        self._size = n
+        self._strategy_col = np.empty(capacity, dtype=object)
+        self._pnl_col = np.empty(capacity, dtype=np.float64)
+        self._vol_col = np.empty(capacity, dtype=np.float64)
+
+        self._strategy_col[:n] = strategies
+        self._pnl_col[:n] = pnl
+        self._vol_col[:n] = vol
+
+    def _append_columns(self, trade: TradeMemory):
+        """Append one trade to the column arrays, doubling capacity when full"""
+        i = self._size
+        if i == len(self._pnl_col):
+            self._strategy_col = np.resize(self._strategy_col, 2 * i)
+            self._pnl_col = np.resize(self._pnl_col, 2 * i)
+            self._vol_col = np.resize(self._vol_col, 2 * i)
+
+        self._strategy_col[i] = trade.strategy
+        self._pnl_col[i] = trade.pnl
+        self._vol_col[i] = trade.market_conditions.get("volatility_atr", 0)
+        self._size = i + 1
+
+    def _rebuild_stats(self):
+        """Recompute aggregate statistics from the loaded history"""
+        self.stats = {}
+        n = self._size
+        for strategy, pnl, vol in zip(
+            self._strategy_col[:n], self._pnl_col[:n].tolist(), self._vol_col[:n].tolist()
+        ):
+            self._accumulate(strategy, pnl, vol)
+
+    def _accumulate(self, strategy: str, pnl: float, volatility_atr: float):
+        """Fold one trade into the running per-strategy statistics"""
+        strat = self.stats.get(strategy)
+        if strat is None:
+            strat = self.stats[strategy] = {
+                "wins": 0,
+                "losses": 0,
+                "total_pnl": 0.0,
+                "win_volatility_atr_sum": 0.0,
+                "best_market_condition": {},
+            }
+
+        strat["total_pnl"] += pnl
+        if pnl > 0:
+            strat["wins"] += 1
+            strat["win_volatility_atr_sum"] += volatility_atr
+        else:
+            strat["losses"] += 1
+
+    def _update_stats(self, trade: TradeMemory):
         """Update aggregate statistics for reinforcement learning"""
-        stats = {}
-        for trade in self.trades:
-            strat = trade.strategy
-            if strat not in stats:
-                stats[strat] = {
-                    "wins": 0,
-                    "losses": 0,
-                    "total_pnl": 0.0,
-                    "best_market_condition": {},
-                }
-
-            stats[strat]["total_pnl"] += trade.pnl
-            if trade.pnl > 0:
-                stats[strat]["wins"] += 1
-            else:
-                stats[strat]["losses"] += 1
+        # O(1) per trade instead of rescanning the whole history
+        with self._stats_lock:
+            self._accumulate(
+                trade.strategy, trade.pnl, trade.market_conditions.get("volatility_atr", 0)
+            )
 
+    def _save_stats(self):
+        """Persist aggregate statistics (called from the writer thread)"""
         try:
-            with open(self.stats_file, "w") as f:
-                json.dump(stats, f, indent=2)
+            with self._stats_lock:
+                data = orjson.dumps(self.stats, option=orjson.OPT_INDENT_2)
+            self.stats_file.write_bytes(data)
         except Exception as e:
             logger.error(f"Failed to save stats: {e}")
 
     def get_intelligence(self, strategy: str) -> Dict[str, Any]:
         """Retrieve insights for a specific strategy"""
-        winning_trades = [
-            t for t in self.trades if t.strategy == strategy and t.pnl > 0
-        ]
-        if not winning_trades:
+        cached = self._intel_cache.get(strategy)
+        if cached is not None and strategy not in self._intel_dirty:
+            return cached
+
+        # Clear the mark before computing: a writer-thread update that lands mid-compute
+        # re-marks the strategy, so the result cached below is recomputed next call
+        self._intel_dirty.discard(strategy)
+        intel = self._compute_intelligence(strategy)
+        self._intel_cache[strategy] = intel
+        return intel
+
+    def _compute_intelligence(self, strategy: str) -> Dict[str, Any]:
+        """Derive a strategy's insights from its running stats and the graph"""
+        agg = self.stats.get(strategy)
+        if agg is None or not agg["wins"]:
             return {"confidence": 0, "suggestion": "Insufficient data"}
 
-        avg_vol = sum(
-            t.market_conditions.get("volatility_atr", 0) for t in winning_trades
-        ) / len(winning_trades)
+        wins = agg["wins"]
+        avg_vol = agg["win_volatility_atr_sum"] / wins
 
-        related_conditions = self.graph.query_relationships(
-            f"Strategy:{strategy}", "INFLUENCED"
+        related_count = len(
+            self.graph.query_relationships(f"Strategy:{strategy}", "INFLUENCED")
         )
 
         return {
-            "confidence": len(winning_trades)
-            / (len([t for t in self.trades if t.strategy == strategy]) + 1),
+            "confidence": wins / (wins + agg["losses"] + 1),
             "optimal_volatility_atr": avg_vol,
-            "graph_insights": len(related_conditions),
+            "graph_insights": related_count,
             "suggestion": "Increase size in similar conditions",
         }
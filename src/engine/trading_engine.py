@@ -9,13 +9,13 @@ import logging
 import json
 import time
 from decimal import Decimal
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 import aiohttp
 from pathlib import Path
 
-from ..utils.hyperliquid_client import HyperliquidClient
+from ..utils.hyperliquid_client import HyperliquidClient, positions_array
 from ..strategies.market_maker import EnhancedMarketMaker, MarketMakerConfig
 from ..strategies.turtle_trading import EnhancedTurtleTrader, TurtleConfig
 from ..strategies.correlation_trading import CorrelationTrader, CorrelationConfig
@@ -25,7 +25,11 @@ from ..monitoring.alert_system import AlertSystem
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Engine loop period, and how many of those ticks pass between monitoring passes
+ENGINE_TICK_SECONDS = 10
+MONITOR_EVERY_TICKS = 6
+
+@dataclass(slots=True)
 class TradingEngineConfig:
     """Main configuration for the trading engine"""
     # API Configuration
@@ -55,6 +59,27 @@ class TradingEngineConfig:
     email_alerts: bool = False
     alert_email_address: Optional[str] = None
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], sandbox_mode: bool = True) -> "TradingEngineConfig":
+        """Build an engine config from a raw config.json mapping"""
+        # Credentials live on the client, and alerts stay off unless configured in code
+        return cls(
+            hyperliquid_api_key="",
+            hyperliquid_secret_key="",
+            sandbox_mode=sandbox_mode,
+            max_portfolio_risk=Decimal(str(data.get("max_portfolio_risk", "1000"))),
+            max_total_leverage=data.get("max_total_leverage", 10),
+            daily_loss_limit=Decimal(str(data.get("daily_loss_limit", "100"))),
+            emergency_stop_enabled=True,
+            enable_market_making=data.get("enable_market_making", False),
+            enable_turtle_trading=data.get("enable_turtle_trading", False),
+            enable_correlation=data.get("enable_correlation", False),
+            enable_mean_reversion=data.get("enable_mean_reversion", False),
+            high_frequency_mode=data.get("high_frequency_mode", False),
+            parallel_execution=True,
+        )
+
+
 class TradingEngine:
     """
     Main trading engine that orchestrates multiple trading strategies
@@ -83,14 +108,19 @@ class TradingEngine:
         self.is_running = False
         self.emergency_stop_triggered = False
         self.start_time: Optional[datetime] = None
-        self.daily_pnl = Decimal('0')
+        self._start_monotonic: Optional[float] = None
+
+        # Short-lived client snapshots shared by the risk, stats and status paths
+        self.snapshot_ttl = 5.0
+        self._snapshot_cache: Dict[str, Tuple[float, Any]] = {}
+        self.daily_pnl = 0.0
         self.last_daily_reset = datetime.now().date()
 
-        # Performance tracking
+        # Performance tracking (plain floats; Decimal stays at the order boundary)
         self.total_trades = 0
-        self.total_pnl = Decimal('0')
-        self.max_drawdown = Decimal('0')
-        self.peak_balance = Decimal('0')
+        self.total_pnl = 0.0
+        self.max_drawdown = 0.0
+        self.peak_balance = 0.0
 
         logger.info("Trading Engine initialized")
 
@@ -110,6 +140,7 @@ class TradingEngine:
             # Initialize monitoring and alert systems
             if self.config.monitoring_enabled:
                 self.performance_monitor = PerformanceMonitor()
+                await self.performance_monitor.start()
                 self.alert_system = AlertSystem(
                     discord_webhook_url=self.config.discord_webhook_url,
                     email_enabled=self.config.email_alerts,
@@ -119,10 +150,6 @@ class TradingEngine:
             # Initialize strategies
             await self._initialize_strategies()
 
-            # Start monitoring task
-            if self.config.monitoring_enabled:
-                asyncio.create_task(self._monitoring_loop())
-
             # Start strategy execution tasks
             strategy_tasks = []
             if self.config.enable_market_making:
@@ -137,6 +164,7 @@ class TradingEngine:
             # Start main engine loop
             self.is_running = True
             self.start_time = datetime.now()
+            self._start_monotonic = time.monotonic()
 
             await self._main_engine_loop()
 
@@ -251,15 +279,17 @@ class TradingEngine:
             logger.error(f"Error in Mean Reversion Trader: {e}")
 
     async def _main_engine_loop(self):
-        """Main engine coordination loop"""
+        """Main engine coordination loop, with monitoring fanned out every few ticks"""
         logger.info("Starting main engine coordination loop")
 
+        tick = 0
         while self.is_running and not self.emergency_stop_triggered:
             try:
                 # Reset daily PnL if new day
-                if datetime.now().date() > self.last_daily_reset:
-                    self.daily_pnl = Decimal('0')
-                    self.last_daily_reset = datetime.now().date()
+                today = datetime.now().date()
+                if today > self.last_daily_reset:
+                    self.daily_pnl = 0.0
+                    self.last_daily_reset = today
                     logger.info("Daily PnL reset")
 
                 # Perform global risk management checks
@@ -268,36 +298,61 @@ class TradingEngine:
                 # Update portfolio statistics
                 await self._update_portfolio_stats()
 
-                # Small delay
-                await asyncio.sleep(10)
+                # Monitoring reuses this tick's account/position snapshots
+                if self.config.monitoring_enabled and tick % MONITOR_EVERY_TICKS == 0:
+                    await self._monitor()
+                tick += 1
+
+                await asyncio.sleep(ENGINE_TICK_SECONDS)
 
             except Exception as e:
                 logger.error(f"Error in main engine loop: {e}")
                 await asyncio.sleep(30)
 
+    def _uptime_seconds(self) -> float:
+        """Seconds since start(), from the monotonic clock"""
+        if self._start_monotonic is None:
+            return 0
+        return time.monotonic() - self._start_monotonic
+
+    async def _client_snapshot(self, method: str) -> Any:
+        """Call a read-only client method, reusing a result younger than snapshot_ttl"""
+        now = time.monotonic()
+        cached = self._snapshot_cache.get(method)
+        if cached is not None and now - cached[0] < self.snapshot_ttl:
+            return cached[1]
+
+        result = await getattr(self.client, method)()
+        self._snapshot_cache[method] = (now, result)
+        return result
+
     async def _global_risk_management(self):
         """Perform global risk management checks"""
         try:
+            config = self.config
+            daily_loss_limit = float(config.daily_loss_limit)
+            max_portfolio_risk = float(config.max_portfolio_risk)
+
             # Get account information
-            account_info = await self.client.get_account_info()
-            total_value = account_info.get("account_value", Decimal('0'))
-            total_position_value = account_info.get("total_notion_pos", Decimal('0'))
-            available_balance = account_info.get("available_balance", Decimal('0'))
+            account_info = await self._client_snapshot("get_account_info")
+            total_value = float(account_info.get("account_value", 0))
+            total_position_value = float(account_info.get("total_notion_pos", 0))
+            available_balance = float(account_info.get("available_balance", 0))
 
             # Check daily loss limit
-            if self.daily_pnl <= -self.config.daily_loss_limit:
+            if self.daily_pnl <= -daily_loss_limit:
                 logger.error(f"🚨 DAILY LOSS LIMIT REACHED: {self.daily_pnl}")
                 await self.emergency_stop()
                 return
 
             # Check portfolio risk limit
-            if total_position_value > self.config.max_portfolio_risk:
-                logger.error(f"🚨 PORTFOLIO RISK LIMIT EXCEEDED: {total_position_value} > {self.config.max_portfolio_risk}")
+            if total_position_value > max_portfolio_risk:
+                logger.error(f"🚨 PORTFOLIO RISK LIMIT EXCEEDED: {total_position_value} > {max_portfolio_risk}")
                 await self.emergency_stop()
                 return
 
             # Check available balance
-            if available_balance < total_value * Decimal('0.1'):  # Less than 10% available
+            if available_balance < total_value * 0.1:  # Less than 10% available
                 logger.warning(f"⚠️ Low available balance: {available_balance} ({available_balance/total_value*100:.1f}%)")
 
             # Update peak balance and drawdown
@@ -306,12 +361,12 @@ class TradingEngine:
 
             current_drawdown = (self.peak_balance - total_value) / self.peak_balance
             if current_drawdown > self.max_drawdown:
-                self.max_drawdown = Decimal(str(current_drawdown))
+                self.max_drawdown = current_drawdown
 
             # Check if drawdown exceeds 15%
             if current_drawdown > 0.15:
                 logger.error(f"🚨 MAX DRAWDOWN EXCEEDED: {current_drawdown:.1%}")
-                if self.config.emergency_stop_enabled:
+                if config.emergency_stop_enabled:
                     await self.emergency_stop()
 
         except Exception as e:
@@ -320,50 +375,43 @@ class TradingEngine:
     async def _update_portfolio_stats(self):
         """Update portfolio statistics"""
         try:
-            positions = await self.client.get_positions()
-
-            # Calculate total PnL
-            total_unrealized_pnl = sum(pos.unrealized_pnl for pos in positions if abs(pos.size) > 0)
+            # Same snapshot the risk checks read, packed for one vectorized reduction
+            positions = positions_array(await self._client_snapshot("get_positions"))
+            total_unrealized_pnl = positions["upnl"].sum()
 
             # Update daily PnL (this would need real-time PnL tracking)
             # For now, use unrealized PnL as approximation
-            self.total_pnl = total_unrealized_pnl
+            self.total_pnl = float(total_unrealized_pnl)
 
             # Log portfolio status
             logger.debug(f"Portfolio: {len(positions)} positions, Total PnL: {self.total_pnl}")
 
             # Send alerts if significant PnL movements
-            if self.alert_system and abs(self.total_pnl) > Decimal('1000'):
+            if self.alert_system and abs(self.total_pnl) > 1000:
                 await self.alert_system.send_pnl_alert(self.total_pnl)
 
         except Exception as e:
             logger.error(f"Error updating portfolio stats: {e}")
 
-    async def _monitoring_loop(self):
-        """Monitoring and alerting loop"""
-        logger.info("Starting monitoring loop")
-
-        while self.is_running:
-            try:
-                # Collect performance metrics from all strategies
-                metrics = await self._collect_all_metrics()
-
-                # Update performance monitor
-                if self.performance_monitor:
-                    await self.performance_monitor.update_metrics(metrics)
+    async def _monitor(self):
+        """Monitoring and alerting pass"""
+        try:
+            # Collect performance metrics from all strategies
+            metrics = await self._collect_all_metrics()
 
-                # Check for alerts
-                if self.alert_system:
-                    await self._check_alert_conditions(metrics)
+            # Update performance monitor
+            if self.performance_monitor:
+                await self.performance_monitor.update_metrics(metrics)
 
-                # Log periodic status
-                await self._log_status()
+            # Check for alerts
+            if self.alert_system:
+                await self._check_alert_conditions(metrics)
 
-                await asyncio.sleep(60)  # Check every minute
+            # Log periodic status
+            await self._log_status()
 
-            except Exception as e:
-                logger.error(f"Error in monitoring loop: {e}")
-                await asyncio.sleep(60)
+        except Exception as e:
+            logger.error(f"Error in monitoring: {e}")
 
     async def _collect_all_metrics(self) -> Dict[str, Any]:
         """Collect performance metrics from all strategies"""
@@ -371,11 +419,11 @@ class TradingEngine:
             metrics = {
                 "engine": {
                     "is_running": self.is_running,
-                    "uptime_seconds": (datetime.now() - self.start_time).total_seconds() if self.start_time else 0,
+                    "uptime_seconds": self._uptime_seconds(),
                     "total_trades": self.total_trades,
-                    "total_pnl": float(self.total_pnl),
-                    "daily_pnl": float(self.daily_pnl),
-                    "max_drawdown": float(self.max_drawdown),
+                    "total_pnl": self.total_pnl,
+                    "daily_pnl": self.daily_pnl,
+                    "max_drawdown": self.max_drawdown,
                     "peak_balance": float(self.peak_balance)
                 }
             }
@@ -434,8 +482,8 @@ class TradingEngine:
     async def _log_status(self):
         """Log periodic status"""
         try:
-            uptime = (datetime.now() - self.start_time).total_seconds() if self.start_time else 0
-            positions = await self.client.get_positions()
+            uptime = self._uptime_seconds()
+            positions = await self._client_snapshot("get_positions")
             active_positions = [pos for pos in positions if abs(pos.size) > 0]
 
             logger.info(
@@ -485,22 +533,26 @@ class TradingEngine:
                 "Trading engine has been gracefully stopped",
                 level="info"
             )
+            await self.alert_system.aclose()
+
+        if self.performance_monitor:
+            await self.performance_monitor.stop()
 
     async def get_status(self) -> Dict[str, Any]:
         """Get current engine status"""
         try:
-            positions = await self.client.get_positions() if self.client else []
+            positions = await self._client_snapshot("get_positions") if self.client else []
             active_positions = [pos for pos in positions if abs(pos.size) > 0]
 
             return {
                 "is_running": self.is_running,
                 "emergency_stop_triggered": self.emergency_stop_triggered,
-                "uptime_seconds": (datetime.now() - self.start_time).total_seconds() if self.start_time else 0,
+                "uptime_seconds": self._uptime_seconds(),
                 "total_trades": self.total_trades,
-                "total_pnl": float(self.total_pnl),
-                "daily_pnl": float(self.daily_pnl),
-                "max_drawdown": float(self.max_drawdown),
-                "peak_balance": float(self.peak_balance),
+                "total_pnl": self.total_pnl,
+                "daily_pnl": self.daily_pnl,
+                "max_drawdown": self.max_drawdown,
+                "peak_balance": self.peak_balance,
                 "active_positions": len(active_positions),
                 "strategies": {
                     "market_maker": self.market_maker is not None,
@@ -3,17 +3,18 @@ Machine Learning Trading Optimizer
 Advanced ML models for signal prediction, position sizing, and market regime detection
 """
 
+import bottleneck as bn
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Dict, List, Tuple, Optional, Any
 import warnings
 warnings.filterwarnings('ignore')
 
 # ML imports
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingRegressor
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from sklearn.model_selection import train_test_split, TimeSeriesSplit
-from sklearn.metrics import accuracy_score, precision_score, recall_score, mean_squared_error
+from sklearn.metrics import accuracy_score, precision_score, recall_score, mean_squared_error, r2_score
 import xgboost as xgb
 import lightgbm as lgb
 
@@ -26,11 +27,22 @@ try:
 except ImportError:
     TORCH_AVAILABLE = False
 
+# Compiled tree inference (optional)
+try:
+    import treelite
+    import tl2cgen
+    TREELITE_AVAILABLE = True
+except ImportError:
+    TREELITE_AVAILABLE = False
+
 import joblib
 import logging
+import os
+import time
 from dataclasses import dataclass
 from enum import Enum
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 @dataclass
@@ -51,6 +63,19 @@ class MLModelConfig:
     prediction_horizon: int
     retrain_frequency: int  # hours
 
+# Model types whose trees are compiled to native code when treelite is installed
+COMPILED_TREE_TYPES = {'xgboost', 'gradient_boost', 'random_forest'}
+
+# Incremental feature updates recompute this many cached rows ahead of the new bars:
+# enough for the longest window chain (volatility -> 100-bar ratio) and for the EMAs
+# to converge to their full-history values
+FEATURE_WARMUP = 500
+# Trailing rows whose lookahead targets (up to 10 bars ahead) change as bars arrive
+FUTURE_HORIZON = 10
+
+# Regression targets whose sign is meaningful, so direction accuracy is a fair score
+SIGNED_TARGETS = {'future_return'}
+
 class MarketRegime(Enum):
     TRENDING_UP = "trending_up"
     TRENDING_DOWN = "trending_down"
@@ -58,6 +83,39 @@ class MarketRegime(Enum):
     VOLATILE = "volatile"
     QUIET = "quiet"
 
+def _move(move_fn, series: pd.Series, window: int, min_count: Optional[int], **kwargs) -> pd.Series:
+    """Trailing-window statistic in C via bottleneck, NaN until min_count values (default: window)"""
+    values = series.to_numpy(dtype=np.float64)
+    if len(values) < window:
+        return pd.Series(np.nan, index=series.index)
+    return pd.Series(move_fn(values, window, min_count=min_count or window, **kwargs), index=series.index)
+
+def rolling_mean(series: pd.Series, window: int, min_count: Optional[int] = None) -> pd.Series:
+    return _move(bn.move_mean, series, window, min_count)
+
+def rolling_std(series: pd.Series, window: int, min_count: Optional[int] = None) -> pd.Series:
+    # ddof=1 matches pandas' rolling().std()
+    return _move(bn.move_std, series, window, min_count, ddof=1)
+
+def rolling_min(series: pd.Series, window: int) -> pd.Series:
+    return _move(bn.move_min, series, window, None)
+
+def rolling_max(series: pd.Series, window: int) -> pd.Series:
+    return _move(bn.move_max, series, window, None)
+
+def rolling_slope(series: pd.Series, window: int) -> pd.Series:
+    """Least-squares slope of each trailing window against x = 0..window-1, NaN until it fills"""
+    # x is the same for every window, so the OLS slope is a dot product with fixed weights
+    x = np.arange(window, dtype=np.float64)
+    x -= x.mean()
+    x /= (x * x).sum()
+
+    values = series.to_numpy(dtype=np.float64)
+    slope = np.full(len(values), np.nan)
+    if len(values) >= window:
+        slope[window - 1:] = sliding_window_view(values, window) @ x
+    return pd.Series(slope, index=series.index)
+
 class NeuralPricePredictor(nn.Module):
     """Neural network for price prediction using PyTorch"""
 
@@ -70,9 +128,9 @@ class NeuralPricePredictor(nn.Module):
         for hidden_size in hidden_sizes:
             layers.extend([
                 nn.Linear(prev_size, hidden_size),
+                nn.BatchNorm1d(hidden_size),  # Directly after Linear so inference can fold it in
                 nn.ReLU(),
-                nn.Dropout(0.2),
-                nn.BatchNorm1d(hidden_size)
+                nn.Dropout(0.2)
             ])
             prev_size = hidden_size
 
@@ -83,6 +141,28 @@ class NeuralPricePredictor(nn.Module):
     def forward(self, x):
         return self.network(x)
 
+class CompiledTreeModel:
+    """Tree ensemble compiled to a shared library, with the predict/predict_proba of the original"""
+
+    def __init__(self, model, libpath: str):
+        self.model = model
+        self.classes_ = getattr(model, 'classes_', None)
+        self._predictor = tl2cgen.Predictor(libpath)
+
+    def _raw(self, X: np.ndarray) -> np.ndarray:
+        return self._predictor.predict(tl2cgen.DMatrix(X)).reshape(len(X), -1)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        proba = self._raw(X)
+        if proba.shape[1] == 1:  # Binary models emit only the positive class
+            proba = np.hstack([1 - proba, proba])
+        return proba
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        if self.classes_ is None:
+            return self._raw(X)[:, 0]
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
 class TradingMLOptimizer:
     """
     Comprehensive ML system for trading optimization with multiple model types
@@ -107,6 +187,25 @@ class TradingMLOptimizer:
         # Initialize model configurations
         self.model_configs = self._initialize_model_configs()
 
+        # Features of every model side by side in one float32 matrix per symbol;
+        # each model reads its columns by position instead of slicing a DataFrame
+        self._feature_cols = sorted(set().union(*(c.features for c in self.model_configs.values())))
+        col_index = {col: i for i, col in enumerate(self._feature_cols)}
+        self._col_pos = {
+            name: np.array([col_index[f] for f in c.features])
+            for name, c in self.model_configs.items()
+        }
+        self._feature_matrix: Dict[str, np.ndarray] = {}
+        self._feature_stamp: Dict[str, tuple] = {}
+
+        # Fitted scaler parameters as float32, so single-row scaling is two
+        # ufuncs instead of scaler.transform
+        self._scaler_mean: Dict[str, np.ndarray] = {}
+        self._scaler_invscale: Dict[str, np.ndarray] = {}
+
+        # Tree and torch inference release the GIL, so ensemble members run side by side
+        self._predict_pool = ThreadPoolExecutor(max_workers=len(self.model_configs))
+
     def _initialize_model_configs(self) -> Dict[str, MLModelConfig]:
         """Initialize configurations for different ML models"""
         configs = {
@@ -158,54 +257,21 @@ class TradingMLOptimizer:
         Prepare comprehensive technical analysis features for ML models
         """
         try:
-            # Basic price features
-            df['price_change'] = df['close'].pct_change()
-            df['log_return'] = np.log(df['close'] / df['close'].shift(1))
-            df['high_low_ratio'] = df['high'] / df['low']
-            df['close_open_ratio'] = df['close'] / df['open']
-
-            # Volume features
-            if 'volume' in df.columns:
-                df['volume_change'] = df['volume'].pct_change()
-                df['volume_ratio'] = df['volume'] / df['volume'].rolling(20).mean()
-                df['volume_volatility'] = df['volume_change'].rolling(10).std()
-                df['volume_price_trend'] = (df['volume'] * df['price_change']).rolling(10).mean()
-
-            # Volatility features
-            df['volatility'] = df['price_change'].rolling(20).std()
-            df['atr'] = self._calculate_atr(df)
-            df['atr_ratio'] = df['atr'] / df['close']
-
-            # Technical indicators
-            df = self._add_technical_indicators(df)
-
-            # Momentum and acceleration
-            df['momentum'] = df['price_change'].rolling(10).mean()
-            df['acceleration'] = df['price_change'] - df['price_change'].shift(1)
-            df['price_acceleration'] = df['momentum'] - df['momentum'].shift(5)
-
-            # Trend features
-            df['trend_strength'] = abs(df['close'].rolling(50).apply(lambda x: np.polyfit(range(len(x)), x, 1)[0]))
-            df['price_momentum'] = (df['close'] / df['close'].shift(10)) - 1
-
-            # Range features
-            df['range_width'] = (df['high'] - df['low']) / df['close']
-            df['breakout_strength'] = (df['close'] - df['close'].shift(20)) / df['close'].shift(20)
-
-            # Market regime features
-            df['volatility_ratio'] = df['volatility'] / df['volatility'].rolling(100).mean()
-            df['volume_trend'] = df['volume'].rolling(20).apply(lambda x: np.polyfit(range(len(x)), x, 1)[0]) if 'volume' in df.columns else 0
-
-            # Future targets for supervised learning
-            df['future_direction'] = np.where(df['close'].shift(-5) > df['close'], 1, 0)
-            df['future_return'] = df['close'].shift(-5) / df['close'] - 1
-            df['future_volatility'] = df['price_change'].shift(-10).rolling(10).std()
-
-            # Market regime classification
-            df['market_regime'] = self._classify_market_regime(df)
+            # The last bar's close catches a still-forming candle being revised in place
+            stamp = (df.index[-1], len(df), df['close'].iat[-1])
+            cached = self.feature_cache.get(symbol)
+
+            if cached is not None and self._feature_stamp.get(symbol) == stamp:
+                return cached
+            if cached is not None and self._extends(cached, df):
+                df = self._extend_features(cached, df)
+            else:
+                df = self._compute_features(df)
 
             # Cache features for the symbol
             self.feature_cache[symbol] = df
+            self._feature_stamp[symbol] = stamp
+            self._feature_matrix[symbol] = self._to_feature_matrix(df)
 
             return df
 
@@ -213,59 +279,142 @@ class TradingMLOptimizer:
             self.logger.error(f"Error preparing features for {symbol}: {e}")
             return df
 
+    @staticmethod
+    def _extends(cached: pd.DataFrame, df: pd.DataFrame) -> bool:
+        """True if df is the cached bars followed by new ones"""
+        n = len(cached)
+        return (
+            len(df) > n
+            and df.index[n - 1] == cached.index[-1]
+            and df['close'].iat[n - 1] == cached['close'].iat[-1]
+        )
+
+    def _extend_features(self, cached: pd.DataFrame, df: pd.DataFrame) -> pd.DataFrame:
+        """Compute features for new bars only, from a warmup slice of the history before them"""
+        n = len(cached)
+        start = max(0, n - FEATURE_WARMUP)
+        tail = self._compute_features(df.iloc[start:].copy())
+
+        # The last FUTURE_HORIZON cached rows get their lookahead targets from the new bars
+        keep = max(start, n - FUTURE_HORIZON)
+        return pd.concat([cached.iloc[:keep], tail.iloc[keep - start:]])
+
+    def _compute_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Full feature pipeline over every row of df"""
+        # Basic price features
+        df['price_change'] = df['close'].pct_change()
+        df['log_return'] = np.log(df['close'] / df['close'].shift(1))
+        df['high_low_ratio'] = df['high'] / df['low']
+        df['close_open_ratio'] = df['close'] / df['open']
+
+        # Volume features
+        if 'volume' in df.columns:
+            df['volume_change'] = df['volume'].pct_change()
+            df['volume_ratio'] = df['volume'] / rolling_mean(df['volume'], 20)
+            df['volume_volatility'] = rolling_std(df['volume_change'], 10)
+            df['volume_price_trend'] = rolling_mean(df['volume'] * df['price_change'], 10)
+
+        # Volatility features
+        df['volatility'] = rolling_std(df['price_change'], 20)
+        df['atr'] = self._calculate_atr(df)
+        df['atr_ratio'] = df['atr'] / df['close']
+
+        # Technical indicators
+        df = self._add_technical_indicators(df)
+
+        # Momentum and acceleration
+        df['momentum'] = rolling_mean(df['price_change'], 10)
+        df['acceleration'] = df['price_change'] - df['price_change'].shift(1)
+        df['price_acceleration'] = df['momentum'] - df['momentum'].shift(5)
+
+        # Trend features
+        df['trend_strength'] = rolling_slope(df['close'], 50).abs()
+        df['price_momentum'] = (df['close'] / df['close'].shift(10)) - 1
+
+        # Range features
+        df['range_width'] = (df['high'] - df['low']) / df['close']
+        df['breakout_strength'] = (df['close'] - df['close'].shift(20)) / df['close'].shift(20)
+
+        # Market regime features
+        df['volatility_ratio'] = df['volatility'] / rolling_mean(df['volatility'], 100)
+        df['volume_trend'] = rolling_slope(df['volume'], 20) if 'volume' in df.columns else 0
+
+        # Future targets for supervised learning
+        close = df['close'].to_numpy(dtype=np.float64)
+        future_close = np.full_like(close, np.nan)
+        future_close[:-5] = close[5:]
+        df['future_direction'] = (future_close > close).astype(np.int8)
+        df['future_return'] = (future_close / close - 1.0).astype(np.float32)
+        df['future_volatility'] = rolling_std(df['price_change'].shift(-10), 10).astype(np.float32)
+
+        # Market regime classification
+        df['market_regime'] = self._classify_market_regime(df)
+
+        return df
+
+    def _to_feature_matrix(self, df: pd.DataFrame) -> np.ndarray:
+        """(N, F) float32 matrix of self._feature_cols, NaN where a column is missing"""
+        return df.reindex(columns=self._feature_cols).to_numpy(dtype=np.float32)
+
+    def _feature_matrix_for(self, df: pd.DataFrame) -> np.ndarray:
+        """Matrix cached by prepare_features for this frame, else a fresh conversion"""
+        for symbol, cached in self.feature_cache.items():
+            if cached is df:
+                return self._feature_matrix[symbol]
+        return self._to_feature_matrix(df)
+
     def _calculate_atr(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
         """Calculate Average True Range"""
-        high = df['high']
-        low = df['low']
-        close = df['close']
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        prev_close = df['close'].shift().to_numpy(dtype=np.float64)
 
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(period).mean()
+        # fmax skips the NaN previous close on the first row, like DataFrame.max did
+        tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        atr = rolling_mean(pd.Series(tr, index=df.index), period)
 
         return atr
 
     def _add_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add technical indicators to the dataframe"""
         try:
+            # Window statistics shared by several indicators, each computed once
+            close = df['close']
+            mean20 = rolling_mean(close, 20)
+            std20 = rolling_std(close, 20)
+            low_min = rolling_min(df['low'], 14)
+            high_max = rolling_max(df['high'], 14)
+
             # RSI
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+            delta = close.diff()
+            gain = rolling_mean(delta.where(delta > 0, 0), 14)
+            loss = rolling_mean(-delta.where(delta < 0, 0), 14)
             rs = gain / loss
             df['rsi'] = 100 - (100 / (1 + rs))
 
-            # MACD
-            exp1 = df['close'].ewm(span=12).mean()
-            exp2 = df['close'].ewm(span=26).mean()
-            df['macd'] = exp1 - exp2
+            # MACD - its legs are the 12/26 EMAs
+            df['ema_12'] = close.ewm(span=12).mean()
+            df['ema_26'] = close.ewm(span=26).mean()
+            df['macd'] = df['ema_12'] - df['ema_26']
             df['macd_signal'] = df['macd'].ewm(span=9).mean()
             df['macd_histogram'] = df['macd'] - df['macd_signal']
 
             # Bollinger Bands
-            df['bb_middle'] = df['close'].rolling(20).mean()
-            bb_std = df['close'].rolling(20).std()
-            df['bb_upper'] = df['bb_middle'] + (bb_std * 2)
-            df['bb_lower'] = df['bb_middle'] - (bb_std * 2)
-            df['bb_position'] = (df['close'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
+            df['bb_middle'] = mean20
+            df['bb_upper'] = mean20 + (std20 * 2)
+            df['bb_lower'] = mean20 - (std20 * 2)
+            df['bb_position'] = (close - df['bb_lower']) / (std20 * 4)
 
             # Moving averages
-            df['sma_20'] = df['close'].rolling(20).mean()
-            df['sma_50'] = df['close'].rolling(50).mean()
-            df['ema_12'] = df['close'].ewm(span=12).mean()
-            df['ema_26'] = df['close'].ewm(span=26).mean()
+            df['sma_20'] = mean20
+            df['sma_50'] = rolling_mean(close, 50)
 
             # Stochastic Oscillator
-            low_min = df['low'].rolling(14).min()
-            high_max = df['high'].rolling(14).max()
-            df['stoch_k'] = 100 * (df['close'] - low_min) / (high_max - low_min)
-            df['stoch_d'] = df['stoch_k'].rolling(3).mean()
+            df['stoch_k'] = 100 * (close - low_min) / (high_max - low_min)
+            df['stoch_d'] = rolling_mean(df['stoch_k'], 3)
 
             # Williams %R
-            df['williams_r'] = -100 * (high_max - df['close']) / (high_max - low_min)
+            df['williams_r'] = -100 * (high_max - close) / (high_max - low_min)
 
         except Exception as e:
             self.logger.error(f"Error adding technical indicators: {e}")
@@ -275,33 +424,29 @@ class TradingMLOptimizer:
     def _classify_market_regime(self, df: pd.DataFrame) -> pd.Series:
         """Classify market regime based on price action and volatility"""
         try:
-            regimes = []
-
-            for i in range(len(df)):
-                if i < 50:  # Not enough data
-                    regimes.append(MarketRegime.QUIET.value)
-                    continue
-
-                # Calculate trend
-                recent_prices = df['close'].iloc[i-20:i]
-                trend_slope = np.polyfit(range(len(recent_prices)), recent_prices, 1)[0]
-
-                # Calculate volatility
-                recent_volatility = df['volatility'].iloc[i-10:i].mean()
-                long_volatility = df['volatility'].iloc[i-50:i].mean()
-
-                # Determine regime
-                if abs(trend_slope) > 0.1:  # Strong trend
-                    if trend_slope > 0:
-                        regimes.append(MarketRegime.TRENDING_UP.value)
-                    else:
-                        regimes.append(MarketRegime.TRENDING_DOWN.value)
-                elif recent_volatility > long_volatility * 1.5:
-                    regimes.append(MarketRegime.VOLATILE.value)
-                elif recent_volatility < long_volatility * 0.5:
-                    regimes.append(MarketRegime.QUIET.value)
-                else:
-                    regimes.append(MarketRegime.RANGING.value)
+            # Row i looks at the windows ending at i-1, hence the shift(1)
+            trend_slope = rolling_slope(df['close'], 20).shift(1).to_numpy()
+            recent_volatility = rolling_mean(df['volatility'], 10, min_count=1).shift(1).to_numpy()
+            long_volatility = rolling_mean(df['volatility'], 50, min_count=1).shift(1).to_numpy()
+
+            # Determine regime - conditions are checked in order, strong trend first
+            strong_trend = np.abs(trend_slope) > 0.1
+            regimes = np.select(
+                [
+                    strong_trend & (trend_slope > 0),
+                    strong_trend,
+                    recent_volatility > long_volatility * 1.5,
+                    recent_volatility < long_volatility * 0.5,
+                ],
+                [
+                    MarketRegime.TRENDING_UP.value,
+                    MarketRegime.TRENDING_DOWN.value,
+                    MarketRegime.VOLATILE.value,
+                    MarketRegime.QUIET.value,
+                ],
+                default=MarketRegime.RANGING.value,
+            ).astype(object)
+            regimes[:50] = MarketRegime.QUIET.value  # Not enough data
 
             return pd.Series(regimes, index=df.index)
 
@@ -317,13 +462,17 @@ class TradingMLOptimizer:
             config = self.model_configs[model_name]
 
             # Prepare data
-            feature_df = df[config.features].copy()
-            target_df = df[config.target_column].copy()
+            feature_data = self._feature_matrix_for(df)[:, self._col_pos[model_name]]
+            target_data = df[config.target_column].to_numpy()
 
-            # Remove NaN values
-            valid_mask = ~(feature_df.isna().any(axis=1) | target_df.isna())
-            features = feature_df[valid_mask]
-            targets = target_df[valid_mask]
+            # Remove NaN/inf values - regime labels are strings, so only numeric targets use isfinite
+            valid_mask = np.isfinite(feature_data).all(axis=1)
+            if target_data.dtype.kind == 'O':
+                valid_mask &= pd.notna(target_data)
+            else:
+                valid_mask &= np.isfinite(target_data)
+            features = feature_data[valid_mask]
+            targets = target_data[valid_mask]
 
             if len(features) < 100:  # Not enough data
                 self.logger.warning(f"Insufficient data for {model_name}: {len(features)} samples")
@@ -340,8 +489,8 @@ class TradingMLOptimizer:
                 tscv = TimeSeriesSplit(n_splits=3)
                 splits = list(tscv.split(features))
                 train_idx, test_idx = splits[-1]  # Use last split
-                X_train, X_test = features.iloc[train_idx], features.iloc[test_idx]
-                y_train, y_test = targets.iloc[train_idx], targets.iloc[test_idx]
+                X_train, X_test = features[train_idx], features[test_idx]
+                y_train, y_test = targets[train_idx], targets[test_idx]
 
             # Scale features
             scaler = StandardScaler()
@@ -350,31 +499,49 @@ class TradingMLOptimizer:
 
             # Train model based on type
             if config.model_type == 'xgboost':
+                # hist makes fit() sketch the float32 matrix straight into a
+                # QuantileDMatrix instead of keeping an exact-split copy
                 model = xgb.XGBClassifier(
                     n_estimators=100,
                     max_depth=6,
                     learning_rate=0.1,
                     subsample=0.8,
                     colsample_bytree=0.8,
+                    tree_method='hist',
+                    max_bin=255,
+                    n_jobs=-1,
                     random_state=42
                 )
             elif config.model_type == 'gradient_boost':
-                model = GradientBoostingRegressor(
+                # Histogram-based splits; max_bin=255 keeps bins in uint8
+                model = lgb.LGBMRegressor(
                     n_estimators=100,
+                    num_leaves=31,
                     max_depth=6,
                     learning_rate=0.1,
                     subsample=0.8,
-                    random_state=42
+                    subsample_freq=1,
+                    max_bin=255,
+                    n_jobs=-1,
+                    random_state=42,
+                    verbose=-1
                 )
             elif config.model_type == 'random_forest':
-                model = RandomForestClassifier(
+                model = lgb.LGBMClassifier(
+                    boosting_type='rf',
                     n_estimators=100,
                     max_depth=10,
+                    subsample=0.8,
+                    subsample_freq=1,
+                    colsample_bytree=0.8,
+                    max_bin=255,
+                    n_jobs=-1,
                     random_state=42,
-                    class_weight='balanced'
+                    class_weight='balanced',
+                    verbose=-1
                 )
             elif config.model_type == 'neural_network' and TORCH_AVAILABLE:
-                model = self._train_neural_network(X_train_scaled, y_train.values, X_test_scaled, y_test.values)
+                model = self._train_neural_network(X_train_scaled, y_train, X_test_scaled, y_test)
             else:
                 raise ValueError(f"Unsupported model type: {config.model_type}")
 
@@ -412,18 +579,19 @@ class TradingMLOptimizer:
                 metrics = {
                     'mse': mse,
                     'rmse': rmse,
+                    'r2': r2_score(y_test, predictions),
                     'direction_accuracy': direction_accuracy,
                     'samples': len(X_test)
                 }
 
+            # Save to disk - the fitted model, not its compiled form
+            self._save_model(model_name, model, scaler)
+
             # Save model and scaler
-            self.models[model_name] = model
-            self.scalers[model_name] = scaler
+            self.models[model_name] = self._compile_model(model_name, model)
+            self._set_scaler(model_name, scaler)
             self.performance_metrics[model_name] = metrics
 
-            # Save to disk
-            self._save_model(model_name, model, scaler)
-
             self.logger.info(f"Trained {model_name} - Metrics: {metrics}")
 
             return {
@@ -441,13 +609,19 @@ class TradingMLOptimizer:
         """Train neural network model"""
         try:
             input_size = X_train.shape[1]
-            model = NeuralPricePredictor(input_size, [64, 32, 16])
+            device = 'cuda' if torch.cuda.is_available() else 'cpu'
+            model = NeuralPricePredictor(input_size, [64, 32, 16]).to(device)
 
-            # Convert to tensors
-            X_train_tensor = torch.FloatTensor(X_train)
-            y_train_tensor = torch.FloatTensor(y_train).unsqueeze(1)
-            X_test_tensor = torch.FloatTensor(X_test)
-            y_test_tensor = torch.FloatTensor(y_test).unsqueeze(1)
+            # bf16 autocast and CUDA-graph compilation only pay off on the GPU
+            use_amp = device == 'cuda' and torch.cuda.is_bf16_supported()
+            train_step_model = torch.compile(model, mode='reduce-overhead') if device == 'cuda' else model
+
+            # Convert to tensors - the whole set fits in device memory, so it is copied
+            # over once and batches are sliced in place rather than fed by a DataLoader
+            X_train_tensor = torch.as_tensor(X_train, dtype=torch.float32, device=device)
+            y_train_tensor = torch.as_tensor(y_train, dtype=torch.float32, device=device).unsqueeze(1)
+            X_test_tensor = torch.as_tensor(X_test, dtype=torch.float32, device=device)
+            y_test_tensor = torch.as_tensor(y_test, dtype=torch.float32, device=device).unsqueeze(1)
 
             # Training setup
             criterion = nn.MSELoss()
@@ -455,31 +629,40 @@ class TradingMLOptimizer:
 
             # Training loop
             epochs = 100
-            batch_size = 32
+            # Large batches only to keep the GPU busy; CPU keeps the tuned 32
+            batch_size = 512 if device == 'cuda' else 32
+            # BatchNorm cannot train on a single row, so a trailing 1-row batch is dropped
+            n_train = len(X_train_tensor)
+            if n_train % batch_size == 1:
+                n_train -= 1
 
             for epoch in range(epochs):
                 model.train()
-                total_loss = 0
+                total_loss = torch.zeros((), device=device)
 
-                for i in range(0, len(X_train_tensor), batch_size):
+                for i in range(0, n_train, batch_size):
                     batch_X = X_train_tensor[i:i+batch_size]
                     batch_y = y_train_tensor[i:i+batch_size]
 
-                    optimizer.zero_grad()
-                    outputs = model(batch_X)
-                    loss = criterion(outputs, batch_y)
+                    optimizer.zero_grad(set_to_none=True)
+                    with torch.autocast(device_type=device, dtype=torch.bfloat16, enabled=use_amp):
+                        outputs = train_step_model(batch_X)
+                        loss = criterion(outputs.float(), batch_y)
                     loss.backward()
                     optimizer.step()
 
-                    total_loss += loss.item()
+                    # Accumulate on the device; .item() per batch would sync every step
+                    total_loss += loss.detach()
 
                 if epoch % 20 == 0:
                     model.eval()
                     with torch.no_grad():
                         test_outputs = model(X_test_tensor)
                         test_loss = criterion(test_outputs, y_test_tensor)
-                    self.logger.info(f"Epoch {epoch}, Train Loss: {total_loss:.4f}, Test Loss: {test_loss:.4f}")
+                    self.logger.info(f"Epoch {epoch}, Train Loss: {total_loss.item():.4f}, Test Loss: {test_loss:.4f}")
 
+            # predict() and joblib expect a CPU module
+            model.to('cpu')
             model.eval()
             return model
 
@@ -497,54 +680,76 @@ class TradingMLOptimizer:
                 if not self._load_model(model_name):
                     raise ValueError(f"Model {model_name} not found")
 
-            model = self.models[model_name]
-            scaler = self.scalers[model_name]
-            config = self.model_configs[model_name]
-
-            # Prepare features
-            feature_data = features[config.features].copy().iloc[-1:]  # Use most recent data
-
-            # Scale features
-            feature_data_scaled = scaler.transform(feature_data)
-
-            # Make prediction
-            if config.model_type == 'neural_network' and TORCH_AVAILABLE:
-                model.eval()
-                with torch.no_grad():
-                    prediction = model(torch.FloatTensor(feature_data_scaled)).detach().numpy()[0][0]
-            else:
-                prediction = model.predict(feature_data_scaled)[0]
-
-            # Calculate confidence
-            if hasattr(model, 'predict_proba') and config.target_column in ['future_direction', 'market_regime']:
-                confidence = np.max(model.predict_proba(feature_data_scaled)[0])
-            else:
-                # For regression models, use feature similarity as confidence
-                confidence = min(1.0, max(0.5, 1.0 - np.std(feature_data_scaled) / 2.0))
-
-            return PredictionResult(
-                symbol=features.index[-1] if hasattr(features, 'index') else 'unknown',
-                prediction=float(prediction),
-                confidence=float(confidence),
-                prediction_type=config.target_column,
-                timestamp=time.time(),
-                features_used=config.features
-            )
+            row = self._feature_matrix_for(features)[-1:]  # Use most recent data
+            return self._predict_row(model_name, row, self._symbol_of(features))
 
         except Exception as e:
             self.logger.error(f"Error making prediction with {model_name}: {e}")
             raise
 
+    @staticmethod
+    def _symbol_of(features: pd.DataFrame):
+        """Label reported on predictions - the last index entry of the feature frame"""
+        return features.index[-1] if hasattr(features, 'index') else 'unknown'
+
+    def _predict_row(self, model_name: str, row: np.ndarray, symbol) -> PredictionResult:
+        """Predict from one (1, F) row of the shared feature matrix"""
+        model = self.models[model_name]
+        config = self.model_configs[model_name]
+
+        # Scale features
+        # A fresh (1, F) row per call - ensemble members for one model can overlap
+        # on the executor, so a shared buffer would be overwritten mid-predict
+        feature_data_scaled = (
+            (row[:, self._col_pos[model_name]] - self._scaler_mean[model_name])
+            * self._scaler_invscale[model_name]
+        )
+
+        # Make prediction
+        if config.model_type == 'neural_network' and TORCH_AVAILABLE:
+            model.eval()
+            with torch.no_grad():
+                prediction = model(torch.FloatTensor(feature_data_scaled)).detach().numpy()[0][0]
+        else:
+            prediction = model.predict(feature_data_scaled)[0]
+
+        # Calculate confidence
+        if hasattr(model, 'predict_proba') and config.target_column in ['future_direction', 'market_regime']:
+            confidence = np.max(model.predict_proba(feature_data_scaled)[0])
+        else:
+            # For regression models, use a held-out score from the last training run: direction
+            # accuracy only means something for signed targets (volatility is always >= 0),
+            # otherwise R^2. Neutral 0.5 when the model was loaded without metrics
+            metrics = self.performance_metrics.get(model_name, {})
+            score_key = 'direction_accuracy' if config.target_column in SIGNED_TARGETS else 'r2'
+            confidence = min(1.0, max(0.5, metrics.get(score_key, 0.5)))
+
+        return PredictionResult(
+            symbol=symbol,
+            prediction=float(prediction),
+            confidence=float(confidence),
+            prediction_type=config.target_column,
+            timestamp=time.time(),
+            features_used=config.features
+        )
+
     def ensemble_predict(self, features: pd.DataFrame) -> Dict[str, PredictionResult]:
         """
         Make ensemble predictions using all available models
         """
         results = {}
 
-        for model_name in self.models.keys():
+        # Extract the latest row once; each model only picks its columns from it
+        row = self._feature_matrix_for(features)[-1:]
+        symbol = self._symbol_of(features)
+
+        futures = {
+            model_name: self._predict_pool.submit(self._predict_row, model_name, row, symbol)
+            for model_name in self.models.keys()
+        }
+        for model_name, future in futures.items():
             try:
-                prediction = self.predict(model_name, features)
-                results[model_name] = prediction
+                results[model_name] = future.result()
             except Exception as e:
                 self.logger.warning(f"Failed to predict with {model_name}: {e}")
 
@@ -605,20 +810,67 @@ class TradingMLOptimizer:
     def _save_model(self, model_name: str, model, scaler):
         """Save model and scaler to disk"""
         try:
-            import os
             os.makedirs(self.models_dir, exist_ok=True)
 
             model_path = f"{self.models_dir}/{model_name}_model.joblib"
             scaler_path = f"{self.models_dir}/{model_name}_scaler.joblib"
 
-            joblib.dump(model, model_path)
-            joblib.dump(scaler, scaler_path)
+            # Compressed on disk - boosters and scalers pickle to bytes/small arrays,
+            # so there is nothing large to memory-map on load anyway
+            joblib.dump(model, model_path, compress=3)
+            joblib.dump(scaler, scaler_path, compress=3)
 
             self.logger.info(f"Saved {model_name} model to disk")
 
         except Exception as e:
             self.logger.error(f"Error saving {model_name} model: {e}")
 
+    def _set_scaler(self, model_name: str, scaler: StandardScaler):
+        """Register a fitted scaler and precompute its float32 inference form"""
+        self.scalers[model_name] = scaler
+        self._scaler_mean[model_name] = scaler.mean_.astype(np.float32)
+        self._scaler_invscale[model_name] = (1.0 / scaler.scale_).astype(np.float32)
+
+    def _compile_model(self, model_name: str, model):
+        """Inference-optimized form of a trained model; the original is what gets saved"""
+        if self.model_configs[model_name].model_type == 'neural_network':
+            return self._freeze_network(model_name, model) if TORCH_AVAILABLE else model
+        return self._compile_trees(model_name, model)
+
+    def _freeze_network(self, model_name: str, model):
+        """Trace the network and fold each BatchNorm into the Linear before it"""
+        try:
+            model.eval()
+            example = torch.zeros(1, model.network[0].in_features)
+            with torch.no_grad():
+                return torch.jit.optimize_for_inference(torch.jit.trace(model, example))
+
+        except Exception as e:
+            self.logger.warning(f"Could not freeze {model_name}, using the eager module: {e}")
+            return model
+
+    def _compile_trees(self, model_name: str, model):
+        """Compile a tree ensemble for fast single-row inference, else return it unchanged"""
+        if not TREELITE_AVAILABLE or self.model_configs[model_name].model_type not in COMPILED_TREE_TYPES:
+            return model
+
+        try:
+            if isinstance(model, xgb.XGBModel):
+                tl_model = treelite.frontend.from_xgboost(model.get_booster())
+            elif isinstance(model, lgb.LGBMModel):
+                tl_model = treelite.frontend.from_lightgbm(model.booster_)
+            else:
+                tl_model = treelite.sklearn.import_model(model)
+
+            os.makedirs(self.models_dir, exist_ok=True)
+            libpath = f"{self.models_dir}/{model_name}_model.so"
+            tl2cgen.export_lib(tl_model, toolchain='gcc', libpath=libpath)
+            return CompiledTreeModel(model, libpath)
+
+        except Exception as e:
+            self.logger.warning(f"Could not compile {model_name}, using the Python predictor: {e}")
+            return model
+
     def _load_model(self, model_name: str) -> bool:
         """Load model and scaler from disk"""
         try:
@@ -631,8 +883,8 @@ class TradingMLOptimizer:
             model = joblib.load(model_path)
             scaler = joblib.load(scaler_path)
 
-            self.models[model_name] = model
-            self.scalers[model_name] = scaler
+            self.models[model_name] = self._compile_model(model_name, model)
+            self._set_scaler(model_name, scaler)
 
             self.logger.info(f"Loaded {model_name} model from disk")
             return True
@@ -5,14 +5,26 @@ Real-time notifications for critical events and performance updates
 
 import asyncio
 import logging
-from typing import Optional, Dict, Any
+import time
+from collections import deque
+from itertools import islice
+from typing import Optional, Dict, Any, Hashable
 from datetime import datetime
 import aiohttp
-import json
+import orjson
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Discord embed color per alert level
+DISCORD_COLORS = {
+    "info": 0x00FF00,  # Green
+    "warning": 0xFFFF00,  # Yellow
+    "critical": 0xFF0000,  # Red
+}
+DISCORD_USERNAME = "Trading Bot Alerts"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 
 class AlertLevel(Enum):
     INFO = "info"
@@ -20,6 +32,42 @@ class AlertLevel(Enum):
     CRITICAL = "critical"
 
 
+class BucketRateLimiter:
+    """
+    Allows one event per key per window.
+    Send times live in one-minute buckets; buckets older than the window are
+    dropped whole, so keys that go quiet are forgotten without a sweep.
+    """
+
+    BUCKET_SECONDS = 60
+
+    def __init__(self, window_seconds: float):
+        self.window = window_seconds
+        self._buckets: deque = deque()  # (bucket start, {key: send time})
+
+    def allow(self, key: Hashable) -> bool:
+        """Record and allow the event unless the same key was allowed within the window"""
+        now = time.monotonic()
+        buckets = self._buckets
+
+        # Rotate out buckets that ended before the window began
+        while buckets and buckets[0][0] + self.BUCKET_SECONDS <= now - self.window:
+            buckets.popleft()
+
+        for _, sent in buckets:
+            last = sent.get(key)
+            if last is not None and now - last < self.window:
+                return False
+
+        if not buckets or now - buckets[-1][0] >= self.BUCKET_SECONDS:
+            buckets.append((now, {}))
+        buckets[-1][1][key] = now
+        return True
+
+    def clear(self):
+        self._buckets.clear()
+
+
 class AlertSystem:
     """
     Advanced alert system with multiple notification channels
@@ -42,12 +90,39 @@ class AlertSystem:
         self.email_address = email_address
 
         # Alert history and rate limiting
-        self.alert_history: list = []
-        self.last_alerts: Dict[str, float] = {}  # For rate limiting
+        self.alert_history: deque = deque(maxlen=1000)
         self.rate_limit_minutes = 5  # Minimum time between similar alerts
+        self._rate_limiter = BucketRateLimiter(self.rate_limit_minutes * 60)
+
+        # Webhook session, created on first send and reused so alerts skip the TLS handshake
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._post = None  # Bound session.post, set alongside the session
 
         logger.info("Alert System initialized")
 
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def _get_post(self):
+        """Bound post method of the shared keep-alive webhook session"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=75)
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=10)
+            )
+            self._post = self._session.post
+        return self._post
+
+    async def aclose(self):
+        """Release pooled webhook connections"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._post = None
+
     async def send_alert(
         self,
         title: str,
@@ -59,32 +134,24 @@ class AlertSystem:
         """Send alert through all configured channels"""
         try:
             # Check rate limiting
-            alert_key = f"{title}_{symbol}_{strategy}" if symbol or strategy else title
-            current_time = datetime.now().timestamp()
-
-            if alert_key in self.last_alerts:
-                time_since_last = current_time - self.last_alerts[alert_key]
-                if time_since_last < self.rate_limit_minutes * 60:
-                    logger.debug(f"Alert rate limited: {title}")
-                    return
-
-            # Update rate limiting
-            self.last_alerts[alert_key] = current_time
+            if not self._rate_limiter.allow((title, symbol, strategy)):
+                logger.debug(f"Alert rate limited: {title}")
+                return
 
-            # Create alert data
+            # Create alert data - numeric ts for stats, ISO string for the embed
+            ts = time.time()
             alert_data = {
                 "title": title,
                 "message": message,
                 "level": level.value,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": datetime.fromtimestamp(ts).isoformat(),
+                "ts": ts,
                 "symbol": symbol,
                 "strategy": strategy,
             }
 
             # Add to history
             self.alert_history.append(alert_data)
-            if len(self.alert_history) > 1000:
-                self.alert_history = self.alert_history[-1000:]
 
             # Send to Discord
             if self.discord_webhook_url:
@@ -171,50 +238,36 @@ class AlertSystem:
             if not self.discord_webhook_url:
                 return
 
-            # Choose color based on alert level
-            colors = {
-                "info": 0x00FF00,  # Green
-                "warning": 0xFFFF00,  # Yellow
-                "critical": 0xFF0000,  # Red
-            }
-            color = colors.get(alert_data["level"], 0x00FF00)
-
-            # Create Discord embed
-            embed = {
-                "title": alert_data["title"],
-                "description": alert_data["message"],
-                "color": color,
-                "timestamp": alert_data["timestamp"],
-                "fields": [],
-            }
-
-            # Add additional fields
-            if alert_data.get("symbol"):
-                embed["fields"].append(
-                    {"name": "Symbol", "value": alert_data["symbol"], "inline": True}
-                )
-
-            if alert_data.get("strategy"):
-                embed["fields"].append(
-                    {
-                        "name": "Strategy",
-                        "value": alert_data["strategy"],
-                        "inline": True,
-                    }
-                )
-
-            # Prepare webhook payload
-            payload = {"embeds": [embed], "username": "Trading Bot Alerts"}
-
-            # Send webhook
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.discord_webhook_url, json=payload, timeout=10
-                ) as response:
-                    if response.status == 204:
-                        logger.debug("Discord alert sent successfully")
-                    else:
-                        logger.warning(f"Discord webhook failed: {response.status}")
+            # Only the symbol/strategy fields that are set
+            fields = [
+                {"name": name, "value": value, "inline": True}
+                for name, value in (("Symbol", alert_data["symbol"]), ("Strategy", alert_data["strategy"]))
+                if value
+            ]
+
+            # Send webhook. The logger methods stay attribute lookups: each send
+            # calls at most one of them once, so binding locals would save nothing
+            post = await self._get_post()
+            async with post(
+                self.discord_webhook_url,
+                headers=JSON_HEADERS,
+                data=orjson.dumps({
+                    "embeds": [
+                        {
+                            "title": alert_data["title"],
+                            "description": alert_data["message"],
+                            "color": DISCORD_COLORS.get(alert_data["level"], DISCORD_COLORS["info"]),
+                            "timestamp": alert_data["timestamp"],
+                            "fields": fields,
+                        }
+                    ],
+                    "username": DISCORD_USERNAME,
+                }),
+            ) as response:
+                if response.status == 204:
+                    logger.debug("Discord alert sent successfully")
+                else:
+                    logger.warning(f"Discord webhook failed: {response.status}")
 
         except Exception as e:
             logger.error(f"Error sending Discord alert: {e}")
@@ -285,7 +338,7 @@ Max Drawdown: {performance_metrics.get("max_drawdown", 0):.2%}
 
     async def get_alert_history(self, limit: int = 100) -> list:
         """Get recent alert history"""
-        return self.alert_history[-limit:] if self.alert_history else []
+        return list(islice(self.alert_history, max(0, len(self.alert_history) - limit), None))
 
     async def get_alert_stats(self) -> Dict[str, Any]:
         """Get alert statistics"""
@@ -293,24 +346,22 @@ Max Drawdown: {performance_metrics.get("max_drawdown", 0):.2%}
             if not self.alert_history:
                 return {}
 
-            # Count by level
+            # Count by level and time period in one pass
             level_counts = {}
+            last_hour = last_day = 0
+            now = time.time()
+            hour_cutoff = now - 3600
+            day_cutoff = now - 86400
+
             for alert in self.alert_history:
                 level = alert.get("level", "info")
                 level_counts[level] = level_counts.get(level, 0) + 1
 
-            # Count by time period
-            now = datetime.now().timestamp()
-            last_hour = sum(
-                1
-                for alert in self.alert_history
-                if now - alert.get("timestamp", 0) < 3600
-            )
-            last_day = sum(
-                1
-                for alert in self.alert_history
-                if now - alert.get("timestamp", 0) < 86400
-            )
+                ts = alert.get("ts", 0)
+                if ts > day_cutoff:
+                    last_day += 1
+                    if ts > hour_cutoff:
+                        last_hour += 1
 
             return {
                 "total_alerts": len(self.alert_history),
@@ -326,7 +377,7 @@ Max Drawdown: {performance_metrics.get("max_drawdown", 0):.2%}
     async def clear_alert_history(self):
         """Clear alert history"""
         self.alert_history.clear()
-        self.last_alerts.clear()
+        self._rate_limiter.clear()
         logger.info("Alert history cleared")
 
     async def test_alerts(self):
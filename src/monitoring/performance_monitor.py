@@ -5,17 +5,23 @@ Real-time tracking of strategy performance, PnL, and key metrics
 
 import asyncio
 import logging
+import time
+from collections import deque
 from decimal import Decimal
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from typing import Deque, Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-import json
 import aiofiles
+import aiofiles.os
+import numpy as np
+import orjson
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+RETURNS_WINDOW = 252  # Trading days in the rolling risk window
+
+@dataclass(slots=True, frozen=True)
 class PerformanceMetrics:
     """Performance metrics data structure"""
     timestamp: float
@@ -46,23 +52,67 @@ class PerformanceMonitor:
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
-        # Performance data storage
-        self.metrics_history: List[PerformanceMetrics] = []
-        self.trade_history: List[Dict] = []
-        self.equity_curve: List[Tuple[float, float]] = []  # (timestamp, equity_value)
+        # Performance data storage, bounded to the last 1000 points each
+        self.metrics_history: Deque[PerformanceMetrics] = deque(maxlen=1000)
+        self.trade_history: Deque[Dict] = deque(maxlen=1000)
+        self.equity_curve: Deque[Tuple[float, float]] = deque(maxlen=1000)  # (timestamp, equity_value)
 
         # Performance calculations
-        self.daily_returns: List[float] = []
+        # Daily returns ring buffer: slot _returns_idx is written next, first _returns_n slots are filled
+        self._returns_buf = np.zeros(RETURNS_WINDOW, dtype=np.float64)
+        self._returns_idx = 0
+        self._returns_n = 0
         self.peak_equity = 0
         self.current_drawdown = 0
         self.max_drawdown = 0
 
+        # First equity point ever seen; equity_curve is bounded, so its head moves on
+        self._start_equity: Optional[float] = None
+        self._start_ts: Optional[float] = None
+
+        # Debounced persistence: updates only flag the monitor dirty, a single writer
+        # task coalesces bursts and appends new equity points instead of rewriting the curve
+        self.save_debounce_seconds = 5
+        self._dirty = asyncio.Event()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._pending_equity: List[Tuple[float, float]] = []
+        self._equity_file = None
+        self._latest_metrics_dict: Optional[Dict[str, Any]] = None
+
         logger.info("Performance Monitor initialized")
 
+    async def start(self):
+        """Start the background metrics writer"""
+        if self._writer_task is None:
+            self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def stop(self):
+        """Stop the writer and flush anything not yet on disk"""
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+
+        await self._save_metrics()
+        if self._equity_file is not None:
+            await self._equity_file.close()
+            self._equity_file = None
+
+    async def _writer_loop(self):
+        """Write metrics at most once per debounce interval while updates keep coming"""
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(self.save_debounce_seconds)
+            self._dirty.clear()
+            await self._save_metrics()
+
     async def update_metrics(self, strategy_metrics: Dict[str, Any]):
         """Update performance metrics from all strategies"""
         try:
-            current_time = datetime.now().timestamp()
+            current_time = time.time()
 
             # Aggregate metrics across all strategies
             total_pnl = 0
@@ -86,6 +136,10 @@ class PerformanceMonitor:
             # Update equity curve
             current_equity = 100000 + total_pnl  # Starting with 100k
             self.equity_curve.append((current_time, current_equity))
+            if self._start_equity is None:
+                self._start_equity = current_equity
+                self._start_ts = current_time
+            self._pending_equity.append((current_time, current_equity))
 
             # Update peak and drawdown
             if current_equity > self.peak_equity:
@@ -96,13 +150,12 @@ class PerformanceMonitor:
                 self.max_drawdown = self.current_drawdown
 
             # Calculate risk-adjusted returns
-            sharpe_ratio = await self._calculate_sharpe_ratio()
-            sortino_ratio = await self._calculate_sortino_ratio()
-            calmar_ratio = await self._calculate_calmar_ratio()
-            volatility = await self._calculate_volatility()
+            sharpe_ratio, sortino_ratio, volatility = self._recompute_risk_metrics()
+            calmar_ratio = self._calculate_calmar_ratio()
 
-            # Create metrics object
-            metrics = PerformanceMetrics(
+            # Create metrics object - the field dict is kept as the saved form, so
+            # persistence never has to reflect over the dataclass with asdict()
+            metrics_fields = dict(
                 timestamp=current_time,
                 total_pnl=total_pnl,
                 daily_pnl=strategy_metrics.get("engine", {}).get("daily_pnl", 0),
@@ -115,84 +168,75 @@ class PerformanceMonitor:
                 calmar_ratio=calmar_ratio,
                 volatility=volatility
             )
+            metrics = PerformanceMetrics(**metrics_fields)
 
             self.metrics_history.append(metrics)
+            self._latest_metrics_dict = metrics_fields
 
-            # Keep only last 1000 metrics points
-            if len(self.metrics_history) > 1000:
-                self.metrics_history = self.metrics_history[-1000:]
-
-            # Save to file periodically
-            if len(self.metrics_history) % 10 == 0:
-                await self._save_metrics()
+            # Hand persistence to the writer task
+            await self.start()
+            self._dirty.set()
 
         except Exception as e:
             logger.error(f"Error updating metrics: {e}")
 
-    async def _calculate_sharpe_ratio(self, risk_free_rate: float = 0.02) -> float:
-        """Calculate Sharpe ratio"""
-        try:
-            if len(self.daily_returns) < 30:
-                return 0
-
-            avg_return = sum(self.daily_returns[-252:]) / min(len(self.daily_returns), 252)  # Daily average
-            return_std = self._calculate_std(self.daily_returns[-252:])
-
-            if return_std == 0:
-                return 0
+    def record_daily_return(self, daily_return: float):
+        """Add one daily return to the rolling risk window"""
+        self._returns_buf[self._returns_idx] = daily_return
+        self._returns_idx = (self._returns_idx + 1) % RETURNS_WINDOW
+        self._returns_n = min(self._returns_n + 1, RETURNS_WINDOW)
 
-            # Annualized Sharpe ratio
-            sharpe = (avg_return * 252 - risk_free_rate) / (return_std * (252 ** 0.5))
-            return sharpe
-
-        except Exception as e:
-            logger.error(f"Error calculating Sharpe ratio: {e}")
-            return 0
+    def _recent_returns(self, count: int) -> np.ndarray:
+        """Last count daily returns, oldest first"""
+        count = min(count, self._returns_n)
+        return np.take(self._returns_buf, np.arange(self._returns_idx - count, self._returns_idx), mode='wrap')
 
-    async def _calculate_sortino_ratio(self, risk_free_rate: float = 0.02) -> float:
-        """Calculate Sortino ratio (downside deviation)"""
+    def _recompute_risk_metrics(self, risk_free_rate: float = 0.02) -> Tuple[float, float, float]:
+        """Calculate Sharpe ratio, Sortino ratio and annualized volatility from one mean/std"""
         try:
-            if len(self.daily_returns) < 30:
-                return 0
+            if self._returns_n < 30:
+                return 0, 0, 0
 
-            avg_return = sum(self.daily_returns[-252:]) / min(len(self.daily_returns), 252)
+            # Order within the window doesn't matter for these statistics
+            returns = self._returns_buf[:self._returns_n]
+            avg_return = returns.mean()  # Daily average
+            return_std = returns.std(ddof=1)
+            excess_return = avg_return * 252 - risk_free_rate
+            annualizer = 252 ** 0.5
 
-            # Calculate downside deviation
-            negative_returns = [r for r in self.daily_returns[-252:] if r < 0]
-            if not negative_returns:
-                return float('inf')
+            # Annualized Sharpe ratio
+            sharpe = excess_return / (return_std * annualizer) if return_std != 0 else 0
 
-            downside_std = self._calculate_std(negative_returns)
+            # Annualized Sortino ratio (downside deviation)
+            negative_returns = returns[returns < 0]
+            downside_std = negative_returns.std(ddof=1) if len(negative_returns) >= 2 else 0
+            sortino = excess_return / (downside_std * annualizer) if downside_std != 0 else float('inf')
 
-            if downside_std == 0:
-                return float('inf')
+            volatility = return_std * annualizer
 
-            # Annualized Sortino ratio
-            sortino = (avg_return * 252 - risk_free_rate) / (downside_std * (252 ** 0.5))
-            return sortino
+            return float(sharpe), float(sortino), float(volatility)
 
         except Exception as e:
-            logger.error(f"Error calculating Sortino ratio: {e}")
-            return 0
+            logger.error(f"Error calculating risk metrics: {e}")
+            return 0, 0, 0
 
-    async def _calculate_calmar_ratio(self) -> float:
+    def _calculate_calmar_ratio(self) -> float:
         """Calculate Calmar ratio (annual return / max drawdown)"""
         try:
             if self.max_drawdown == 0:
                 return 0
 
             # Calculate annualized return
-            if len(self.equity_curve) < 2:
+            if self._start_equity is None:
                 return 0
 
-            start_equity = self.equity_curve[0][1]
-            current_equity = self.equity_curve[-1][1]
-            days_elapsed = (self.equity_curve[-1][0] - self.equity_curve[0][0]) / 86400
+            current_ts, current_equity = self.equity_curve[-1]
+            days_elapsed = (current_ts - self._start_ts) / 86400
 
             if days_elapsed == 0:
                 return 0
 
-            annual_return = ((current_equity / start_equity) ** (365 / days_elapsed)) - 1
+            annual_return = ((current_equity / self._start_equity) ** (365 / days_elapsed)) - 1
             calmar = annual_return / self.max_drawdown
 
             return calmar
@@ -201,48 +245,31 @@ class PerformanceMonitor:
             logger.error(f"Error calculating Calmar ratio: {e}")
             return 0
 
-    async def _calculate_volatility(self) -> float:
-        """Calculate portfolio volatility"""
-        try:
-            if len(self.daily_returns) < 30:
-                return 0
-
-            return self._calculate_std(self.daily_returns[-252:]) * (252 ** 0.5)  # Annualized
-
-        except Exception as e:
-            logger.error(f"Error calculating volatility: {e}")
-            return 0
-
-    def _calculate_std(self, values: List[float]) -> float:
-        """Calculate standard deviation"""
-        if len(values) < 2:
-            return 0
-
-        mean = sum(values) / len(values)
-        variance = sum((x - mean) ** 2 for x in values) / (len(values) - 1)
-        return variance ** 0.5
-
     async def _save_metrics(self):
         """Save metrics to file"""
         try:
             # Save latest metrics
-            if self.metrics_history:
-                latest_metrics = asdict(self.metrics_history[-1])
+            if self._latest_metrics_dict is not None:
+                latest_metrics = self._latest_metrics_dict
                 metrics_file = self.data_dir / "latest_metrics.json"
 
-                async with aiofiles.open(metrics_file, 'w') as f:
-                    await f.write(json.dumps(latest_metrics, indent=2))
+                # Write-then-rename so readers never see a half-written file
+                tmp_file = metrics_file.with_suffix(".json.tmp")
+                async with aiofiles.open(tmp_file, 'wb') as f:
+                    await f.write(orjson.dumps(latest_metrics, option=orjson.OPT_INDENT_2))
+                await aiofiles.os.replace(tmp_file, metrics_file)
 
-            # Save equity curve
-            if self.equity_curve:
-                equity_file = self.data_dir / "equity_curve.json"
-                equity_data = [
-                    {"timestamp": ts, "equity": equity}
-                    for ts, equity in self.equity_curve
-                ]
+            # Append equity points recorded since the last save
+            if self._pending_equity:
+                pending, self._pending_equity = self._pending_equity, []
+                if self._equity_file is None:
+                    self._equity_file = await aiofiles.open(self.data_dir / "equity_curve.jsonl", 'ab')
 
-                async with aiofiles.open(equity_file, 'w') as f:
-                    await f.write(json.dumps(equity_data, indent=2))
+                await self._equity_file.write(b"".join(
+                    orjson.dumps({"timestamp": ts, "equity": equity}) + b"\n"
+                    for ts, equity in pending
+                ))
+                await self._equity_file.flush()
 
         except Exception as e:
             logger.error(f"Error saving metrics: {e}")
@@ -250,13 +277,9 @@ class PerformanceMonitor:
     async def add_trade(self, trade_data: Dict[str, Any]):
         """Add trade to history"""
         try:
-            trade_data["timestamp"] = datetime.now().timestamp()
+            trade_data["timestamp"] = time.time()
             self.trade_history.append(trade_data)
 
-            # Keep only last 1000 trades
-            if len(self.trade_history) > 1000:
-                self.trade_history = self.trade_history[-1000:]
-
         except Exception as e:
             logger.error(f"Error adding trade: {e}")
 
@@ -270,7 +293,8 @@ class PerformanceMonitor:
 
             # Calculate additional metrics
             total_return = (latest.total_pnl / 100000) * 100  # Assuming 100k starting capital
-            daily_avg_return = sum(self.daily_returns[-30:]) / min(len(self.daily_returns), 30) if self.daily_returns else 0
+            recent_returns = self._recent_returns(30)
+            daily_avg_return = float(recent_returns.mean()) if len(recent_returns) else 0
 
             return {
                 "total_return_pct": total_return,
@@ -307,7 +331,7 @@ class PerformanceMonitor:
                 try:
                     async with aiofiles.open(strategy_file, 'r') as f:
                         data = await f.read()
-                        strategy_performance[strategy_name] = json.loads(data)
+                        strategy_performance[strategy_name] = orjson.loads(data)
                 except:
                     continue
 
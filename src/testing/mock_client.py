@@ -51,8 +51,20 @@ class MockHyperliquidClient:
         logger.info("Mock Client Disconnected")
 
     def update_market_state(self, symbol: str, candle: Dict[str, Any]):
-        price = Decimal(str(candle["close"]))
-        timestamp = int(candle["timestamp"])
+        self.update_market_bar(
+            symbol,
+            candle["timestamp"],
+            candle["open"],
+            candle["high"],
+            candle["low"],
+            candle["close"],
+            candle["volume"],
+        )
+
+    def update_market_bar(self, symbol, timestamp, open_, high, low, close, volume):
+        """Positional form of update_market_state, fed straight from row tuples"""
+        price = Decimal(str(close))
+        timestamp = int(timestamp)
 
         self.current_prices[symbol] = price
         self.current_time = timestamp
@@ -63,11 +75,11 @@ class MockHyperliquidClient:
         self.price_history[symbol].append(
             (
                 timestamp,
-                Decimal(str(candle["open"])),
-                Decimal(str(candle["high"])),
-                Decimal(str(candle["low"])),
-                Decimal(str(candle["close"])),
-                Decimal(str(candle["volume"])),
+                Decimal(str(open_)),
+                Decimal(str(high)),
+                Decimal(str(low)),
+                price,
+                Decimal(str(volume)),
             )
         )
 
@@ -8,6 +8,8 @@ from typing import Optional, Dict, List, Tuple
 from pathlib import Path
 from decimal import Decimal
 
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
 
 class DataLoader:
     def __init__(self, data_dir: str = "data/market_data"):
@@ -24,9 +26,8 @@ class DataLoader:
         # Standardize columns
         df.columns = [col.lower() for col in df.columns]
 
-        required_cols = ["timestamp", "open", "high", "low", "close", "volume"]
-        if not all(col in df.columns for col in required_cols):
-            raise ValueError(f"CSV must contain columns: {required_cols}")
+        if not all(col in df.columns for col in OHLCV_COLUMNS):
+            raise ValueError(f"CSV must contain columns: {OHLCV_COLUMNS}")
 
         # Ensure timestamp is sorted
         df = df.sort_values("timestamp")
@@ -52,3 +53,8 @@ class DataLoader:
     def dataframe_to_iterator(df: pd.DataFrame):
         """Convert DataFrame to iterator of dicts for backtesting"""
         return df.to_dict("records")
+
+    @staticmethod
+    def iter_rows(df: pd.DataFrame):
+        """Iterate (timestamp, open, high, low, close, volume) tuples for backtesting"""
+        return df[OHLCV_COLUMNS].itertuples(index=False, name=None)
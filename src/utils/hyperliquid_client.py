@@ -8,6 +8,7 @@ import asyncio
 import logging
 import json
 import time
+import numpy as np
 from decimal import Decimal
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
@@ -19,6 +20,17 @@ from hyperliquid.utils import constants
 
 logger = logging.getLogger(__name__)
 
+# Row layout for positions_array: floats for aggregation, not order sizing
+POSITION_DTYPE = np.dtype([("symbol", "U16"), ("size", "f8"), ("upnl", "f8")])
+
+
+def positions_array(positions: List["Position"]) -> np.ndarray:
+    """Pack get_positions() results into a POSITION_DTYPE structured array"""
+    return np.array(
+        [(p.symbol, float(p.size), float(p.unrealized_pnl)) for p in positions],
+        dtype=POSITION_DTYPE,
+    )
+
 
 @dataclass
 class MarketData:
@@ -259,6 +259,24 @@ def test_data_loader_missing_columns(temp_data_dir):
     assert "must contain columns" in str(excinfo.value)
 
 
+def test_data_loader_iter_rows():
+    """Test rows come out as OHLCV tuples regardless of column order."""
+    df = pd.DataFrame(
+        {
+            "volume": [1000, 1100],
+            "close": [105.0, 106.0],
+            "timestamp": [1000, 2000],
+            "open": [100.0, 101.0],
+            "high": [110.0, 111.0],
+            "low": [90.0, 91.0],
+        }
+    )
+
+    rows = list(DataLoader.iter_rows(df))
+
+    assert rows == [(1000, 100.0, 110.0, 90.0, 105.0, 1000), (2000, 101.0, 111.0, 91.0, 106.0, 1100)]
+
+
 # -----------------------------------------------------------------------------
 # Test BacktestEngine
 # -----------------------------------------------------------------------------
@@ -275,7 +293,7 @@ def mock_config():
 @pytest.fixture
 def backtest_engine(mock_config, temp_data_dir):
     loader = DataLoader(data_dir=temp_data_dir)
-    return BacktestEngine(mock_config, loader)
+    return BacktestEngine(mock_config, loader, results_dir=temp_data_dir)
 
 
 @pytest.mark.asyncio
@@ -303,7 +321,8 @@ async def test_backtest_run_with_synthetic_data(backtest_engine):
     assert mock_strategy.iteration.called
     assert results is not None
     assert "final_value" in results
-    assert "history" in results
+    history = pd.read_parquet(results["history_path"])
+    assert len(history) == results["total_trades"]
 
 
 @pytest.mark.asyncio
@@ -330,6 +349,22 @@ async def test_backtest_run_with_csv_data(backtest_engine, temp_data_dir):
     assert backtest_engine.mock_client.current_time == data["timestamp"][-1]
 
 
+def test_vectorized_backtest(backtest_engine):
+    """Test the column-wise breakout backtest on synthetic data."""
+    df = backtest_engine._generate_synthetic_data("2023-01-01", "2023-01-10")
+
+    results = backtest_engine.vectorized_backtest(df)
+
+    assert len(results["equity"]) == len(df)
+    assert float(results["final_value"]) > 0
+    assert results["total_trades"] > 0
+    # Every exit closes an earlier entry; a flip counts as both
+    assert results["total_trades"] == results["entries"] + results["exits"]
+    assert results["entries"] - 1 <= results["exits"] <= results["entries"]
+    # Positions only take breakout directions
+    assert set(results["position"].unique()) <= {-1.0, 0.0, 1.0}
+
+
 def test_generate_synthetic_data(backtest_engine):
     """Test the synthetic data generation method."""
     df = backtest_engine._generate_synthetic_data("2023-01-01", "2023-01-05")
@@ -0,0 +1,61 @@
+import random
+import sys
+import types
+
+import orjson
+import pytest
+
+# live_micro_trader reads its keys from config_keys at import time
+_config_keys = types.ModuleType("config_keys")
+_config_keys.HYPERLIQUID_PRIVATE_KEY = ""
+_config_keys.HYPERLIQUID_ADDRESS = ""
+_config_keys.TRADING_CONFIG = {}
+_config_keys.RISK_LIMITS = {}
+_config_keys.DISCORD_WEBHOOK_URL = ""
+sys.modules.setdefault("config_keys", _config_keys)
+
+from live_micro_trader import _is_plain_json_string, format_order_message  # noqa: E402
+
+
+# -----------------------------------------------------------------------------
+# Test format_order_message
+# -----------------------------------------------------------------------------
+
+
+def _reference_message(symbol, size, price, side, nonce):
+    return orjson.dumps(
+        {
+            "order": {
+                "a": symbol,
+                "b": size,
+                "p": price,
+                "s": side,
+                "r": "GTC",
+                "t": {"limit": {"tif": "GTC"}},
+            },
+            "nonce": nonce,
+        }
+    )
+
+
+def test_format_order_message_matches_orjson():
+    """Template output is byte-identical to orjson for randomized orders."""
+    rng = random.Random(42)
+    for _ in range(1000):
+        symbol = rng.choice(["WIF", "BTC", "ETH", "kPEPE"])
+        size = str(round(rng.uniform(0, 10_000), rng.randint(0, 6)))
+        price = str(rng.uniform(1e-6, 100_000))
+        side = rng.choice(["B", "S"])
+        nonce = rng.randint(0, 2**53)
+
+        assert format_order_message(symbol, size, price, side, nonce) == (
+            _reference_message(symbol, size, price, side, nonce)
+        )
+
+
+@pytest.mark.parametrize(
+    "symbol, plain", [("WIF", True), ("kPEPE", True), ('W"IF', False), ("W\\IF", False)]
+)
+def test_template_signing_only_for_plain_symbols(symbol, plain):
+    """Symbols that need JSON escaping fall back to orjson signing."""
+    assert _is_plain_json_string(symbol) is plain